@@ -4,6 +4,10 @@ Constants for Virus Sandbox Game
 All magic numbers, configuration values, and game parameters.
 """
 
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+
 # =================== GAME ECONOMY ===================
 DEFAULT_STARTING_EP = 100
 DEFAULT_GENE_REMOVE_COST = 10
@@ -27,21 +31,23 @@ MAX_DEGRADATION_RATE = 1.0
 DEFAULT_BASE_ENTITY_NAME = "unenveloped virion (extracellular)"
 
 # Entity locations
-LOCATION_EXTRACELLULAR = "extracellular"
-LOCATION_CYTOPLASM = "cytoplasm"
-LOCATION_ENDOSOME = "endosome"
-LOCATION_NUCLEUS = "nucleus"
-LOCATION_MEMBRANE = "membrane"
-LOCATION_UNKNOWN = "unknown"
-
-VALID_LOCATIONS = [
+LOCATION_EXTRACELLULAR = sys.intern("extracellular")
+LOCATION_CYTOPLASM = sys.intern("cytoplasm")
+LOCATION_ENDOSOME = sys.intern("endosome")
+LOCATION_NUCLEUS = sys.intern("nucleus")
+LOCATION_MEMBRANE = sys.intern("membrane")
+LOCATION_UNKNOWN = sys.intern("unknown")
+
+# Ordered for display (comboboxes); use the frozenset for membership tests
+VALID_LOCATIONS_ORDER = (
     LOCATION_EXTRACELLULAR,
     LOCATION_CYTOPLASM,
     LOCATION_ENDOSOME,
     LOCATION_NUCLEUS,
     LOCATION_MEMBRANE,
     LOCATION_UNKNOWN
-]
+)
+VALID_LOCATIONS = frozenset(VALID_LOCATIONS_ORDER)
 
 # Entity classes
 ENTITY_CLASS_VIRION = "virion"
@@ -51,14 +57,15 @@ ENTITY_CLASS_DNA = "DNA"
 ENTITY_CLASS_COMPLEX = "complex"
 ENTITY_CLASS_UNKNOWN = "unknown"
 
-VALID_ENTITY_CLASSES = [
+VALID_ENTITY_CLASSES_ORDER = (
     ENTITY_CLASS_VIRION,
     ENTITY_CLASS_PROTEIN,
     ENTITY_CLASS_RNA,
     ENTITY_CLASS_DNA,
     ENTITY_CLASS_COMPLEX,
     ENTITY_CLASS_UNKNOWN
-]
+)
+VALID_ENTITY_CLASSES = frozenset(VALID_ENTITY_CLASSES_ORDER)
 
 # =================== INTERFERON SYSTEM ===================
 INTERFERON_MIN = 0.0
@@ -71,6 +78,12 @@ INTERFERON_RNA_DEGRADATION_BONUS = 0.0125  # 1.25% per level
 INTERFERON_PROTEIN_DEGRADATION_BONUS = 0.0075  # 0.75% per level
 INTERFERON_DNA_DEGRADATION_BONUS = 0.005  # 0.5% per level
 
+INTERFERON_DEGRADATION_BONUS_BY_CLASS = MappingProxyType({
+    ENTITY_CLASS_RNA: INTERFERON_RNA_DEGRADATION_BONUS,
+    ENTITY_CLASS_PROTEIN: INTERFERON_PROTEIN_DEGRADATION_BONUS,
+    ENTITY_CLASS_DNA: INTERFERON_DNA_DEGRADATION_BONUS
+})
+
 # Interferon thresholds for display
 INTERFERON_THRESHOLD_HIGH = 75.0
 INTERFERON_THRESHOLD_MEDIUM = 50.0
@@ -80,29 +93,30 @@ INTERFERON_THRESHOLD_LOW = 25.0
 RULE_TYPE_PER_ENTITY = "per_entity"
 RULE_TYPE_PER_PAIR = "per_pair"
 
-VALID_RULE_TYPES = [RULE_TYPE_PER_ENTITY, RULE_TYPE_PER_PAIR]
+VALID_RULE_TYPES = frozenset({RULE_TYPE_PER_ENTITY, RULE_TYPE_PER_PAIR})
 
 # Effect types
 EFFECT_TYPE_ADD_TRANSITION = "add_transition"
 EFFECT_TYPE_MODIFY_TRANSITION = "modify_transition"
 EFFECT_TYPE_ENABLE_ENTITY = "enable_entity"
 
-VALID_EFFECT_TYPES = [
+VALID_EFFECT_TYPES = frozenset({
     EFFECT_TYPE_ADD_TRANSITION,
     EFFECT_TYPE_MODIFY_TRANSITION,
     EFFECT_TYPE_ENABLE_ENTITY
-]
+})
 
 # =================== MILESTONES ===================
 MILESTONE_TYPE_SURVIVE_TURNS = "survive_turns"
 MILESTONE_TYPE_PEAK_ENTITY_COUNT = "peak_entity_count"
 MILESTONE_TYPE_CUMULATIVE_ENTITY_COUNT = "cumulative_entity_count"
 
-VALID_MILESTONE_TYPES = [
+VALID_MILESTONE_TYPES_ORDER = (
     MILESTONE_TYPE_SURVIVE_TURNS,
     MILESTONE_TYPE_PEAK_ENTITY_COUNT,
     MILESTONE_TYPE_CUMULATIVE_ENTITY_COUNT
-]
+)
+VALID_MILESTONE_TYPES = frozenset(VALID_MILESTONE_TYPES_ORDER)
 
 # =================== DATABASE ===================
 DATABASE_VERSION = "1.0"
@@ -136,6 +150,24 @@ FONT_ITALIC_SMALL = ("Arial", 9, "italic")
 FONT_CONSOLE = ("Consolas", 11)
 FONT_UI_MONO = ("Segoe UI", 11)
 
+
+@dataclass(frozen=True, slots=True)
+class _Fonts:
+    """Read-only namespace of the FONT_* tuples for widget creation."""
+    TITLE: tuple = FONT_TITLE
+    SUBTITLE: tuple = FONT_SUBTITLE
+    HEADER: tuple = FONT_HEADER
+    SUBHEADER: tuple = FONT_SUBHEADER
+    BODY: tuple = FONT_BODY
+    SMALL: tuple = FONT_SMALL
+    TINY: tuple = FONT_TINY
+    ITALIC_SMALL: tuple = FONT_ITALIC_SMALL
+    CONSOLE: tuple = FONT_CONSOLE
+    UI_MONO: tuple = FONT_UI_MONO
+
+
+FONTS = _Fonts()
+
 # Colors
 COLOR_TEXT_PRIMARY = "#2d3748"
 COLOR_TEXT_SECONDARY = "#4a5568"
@@ -172,11 +204,12 @@ GRAPH_MARGIN_TOP = 20
 GRAPH_MARGIN_BOTTOM = 30
 
 # =================== SIMULATION DISPLAY ===================
-CONSOLE_SEPARATOR_FULL = "=" * 70
-CONSOLE_SEPARATOR_HALF = "-" * 70
-CONSOLE_SEPARATOR_SECTION = "-" * 35
+CONSOLE_SEPARATOR_FULL = sys.intern("=" * 70)
+CONSOLE_SEPARATOR_HALF = sys.intern("-" * 70)
+CONSOLE_SEPARATOR_SECTION = sys.intern("-" * 35)
 
 DRAMATIC_DISPLAY_DELAY = 0.1  # Seconds between events
+CONSOLE_LOG_MAX_LINES = 5000  # Turn-log lines a simulation keeps in memory
 
 # =================== BUILDER SETTINGS ===================
 BUILDER_GENE_LIST_HEIGHT = 8
@@ -196,28 +229,29 @@ EFFECT_EDITOR_MAX_INPUTS = 3
 EFFECT_EDITOR_MAX_OUTPUTS = 3
 
 # =================== LOCATION DISPLAY ORDER ===================
-LOCATION_DISPLAY_ORDER = [
+LOCATION_DISPLAY_ORDER = (
     LOCATION_EXTRACELLULAR,
     LOCATION_MEMBRANE,
     LOCATION_ENDOSOME,
     LOCATION_CYTOPLASM,
     LOCATION_NUCLEUS
-]
+)
 
-LOCATION_DISPLAY_LABELS = {
+# Read-only lookup table keyed by the interned LOCATION_* strings
+LOCATION_DISPLAY_LABELS = MappingProxyType({
     LOCATION_EXTRACELLULAR: "EXTRACELLULAR",
     LOCATION_MEMBRANE: "MEMBRANE",
     LOCATION_CYTOPLASM: "CYTOPLASM",
     LOCATION_ENDOSOME: "ENDOSOME",
     LOCATION_NUCLEUS: "NUCLEUS"
-}
+})
 
 # =================== FILE TYPES ===================
-FILE_TYPE_JSON = [("JSON files", "*.json"), ("All files", "*.*")]
+FILE_TYPE_JSON = (("JSON files", "*.json"), ("All files", "*.*"))
 DEFAULT_SAMPLE_FILENAME = "sample_virus_genes.json"
 
 # =================== TEXT WIDGET STYLING ===================
-TEXT_WIDGET_CONFIG = {
+TEXT_WIDGET_CONFIG = MappingProxyType({
     "font": FONT_UI_MONO,
     "bg": COLOR_BG_WHITE,
     "fg": COLOR_TEXT_PRIMARY,
@@ -229,9 +263,9 @@ TEXT_WIDGET_CONFIG = {
     "highlightthickness": 0,
     "padx": 12,
     "pady": 8
-}
+})
 
-CONSOLE_WIDGET_CONFIG = {
+CONSOLE_WIDGET_CONFIG = MappingProxyType({
     "font": FONT_CONSOLE,
     "bg": COLOR_BG_LIGHT,
     "fg": COLOR_TEXT_PRIMARY,
@@ -243,4 +277,4 @@ CONSOLE_WIDGET_CONFIG = {
     "highlightthickness": 0,
     "padx": 10,
     "pady": 6
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -4,9 +4,25 @@ Data Models and Database Management
 Handles gene database loading, saving, validation, and access.
 """
 
+import copy
 import json
+import os
+import re
+import stat
+from collections import Counter, OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Callable, Iterable, Mapping, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON backend; stdlib json is the fallback
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # Optional lazy parser used for loading only
+    simdjson = None
 
 from constants import (
     DEFAULT_DEGRADATION_RATE,
@@ -14,88 +30,615 @@ from constants import (
     DATABASE_VERSION,
     DATABASE_DEFAULT_NAME,
     VALID_MILESTONE_TYPES,
+    VALID_MILESTONE_TYPES_ORDER,
+    MILESTONE_TYPE_PEAK_ENTITY_COUNT,
+    MILESTONE_TYPE_CUMULATIVE_ENTITY_COUNT,
     LOCATION_EXTRACELLULAR,
     LOCATION_CYTOPLASM,
     LOCATION_ENDOSOME,
     LOCATION_NUCLEUS,
+    LOCATION_UNKNOWN,
     ENTITY_CLASS_VIRION,
     ENTITY_CLASS_PROTEIN,
     ENTITY_CLASS_RNA,
     ENTITY_CLASS_DNA,
+    ENTITY_CLASS_UNKNOWN,
+)
+
+_REQUIRED_DATABASE_KEYS = ("database_info", "genes", "entities")
+_MILESTONE_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+_COUNT_MILESTONE_TYPES = frozenset({MILESTONE_TYPE_PEAK_ENTITY_COUNT, MILESTONE_TYPE_CUMULATIVE_ENTITY_COUNT})
+_EMPTY: tuple = ()
+
+# Streaming saves flush at this size; fdatasync falls back to fsync where
+# the platform lacks it (Windows)
+_WRITE_BUFFER_SIZE = 128 * 1024
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+# The stdlib encoding of a saved database; both save paths use this one
+# encoder, so a streamed save writes the same file as save_database
+_DATABASE_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+# orjson writes the same bytes as _DATABASE_ENCODER
+# except for floats Python prints in exponent form (1e-05 vs 0.00001),
+# non-finite floats (written as null) and ints outside 64 bits (rejected)
+_ORJSON_INT_RANGE = range(-(1 << 63), 1 << 64)
+
+
+def _orjson_matches_stdlib(value: Any) -> bool:
+    """Check whether orjson would encode a JSON tree exactly like the stdlib."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str) or item is None:
+            continue
+        if isinstance(item, float):
+            magnitude = abs(item)
+            if item != 0.0 and not 1e-4 <= magnitude < 1e16:
+                return False
+        elif isinstance(item, int):
+            if item not in _ORJSON_INT_RANGE:
+                return False
+        elif isinstance(item, dict):
+            for key, child in item.items():
+                if not isinstance(key, str):
+                    return False
+                stack.append(child)
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        else:
+            return False
+    return True
+
+
+def _fchmod(fd: int, path: str, mode: int) -> None:
+    """Set an open file's permission bits (by path where fchmod is missing)."""
+    if hasattr(os, "fchmod"):
+        os.fchmod(fd, mode)
+    else:
+        os.chmod(path, mode)
+
+
+def _iso_now() -> str:
+    """Current local time as an ISO-8601 string at second precision."""
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _collect_referenced_entities(gene_data: Dict) -> Tuple[str, ...]:
+    """Entity names a gene's enable_entity/add_transition effects refer to."""
+    referenced = []
+    for effect in gene_data.get("effects", _EMPTY):
+        effect_type = effect["type"]
+        if effect_type == "enable_entity":
+            referenced.append(effect["entity"])
+        elif effect_type == "add_transition":
+            rule = effect["rule"]
+            referenced.extend(spec["entity"] for spec in rule["inputs"])
+            referenced.extend(spec["entity"] for spec in rule["outputs"])
+    return tuple(referenced)
+
+
+def _write_all(fd: int, data) -> None:
+    """Write a bytes-like object to fd, retrying short writes."""
+    view = memoryview(data)
+    written = 0
+    while written < len(view):
+        written += os.write(fd, view[written:])
+
+
+# Static templates; always copied before being stored in a database
+_BASE_ENTITY_TEMPLATE = {
+    "name": DEFAULT_BASE_ENTITY_NAME,
+    "description": "Basic viral particle outside the cell",
+    "base_degradation_rate": DEFAULT_DEGRADATION_RATE,
+    "location": LOCATION_EXTRACELLULAR,
+    "entity_class": ENTITY_CLASS_VIRION,
+    "is_starter": True
+}
+
+_SAMPLE_ENTITIES = {
+    "unenveloped virion (extracellular)": {
+        "name": "unenveloped virion (extracellular)",
+        "description": "Basic viral particle outside the cell",
+        "base_degradation_rate": 0.05,
+        "location": LOCATION_EXTRACELLULAR,
+        "entity_class": ENTITY_CLASS_VIRION,
+        "is_starter": True
+    },
+    "enveloped virion (extracellular)": {
+        "name": "enveloped virion (extracellular)",
+        "description": "Viral particle with lipid envelope",
+        "base_degradation_rate": 0.08,
+        "location": LOCATION_EXTRACELLULAR,
+        "entity_class": ENTITY_CLASS_VIRION,
+        "is_starter": True
+    },
+    "viral spore (extracellular)": {
+        "name": "viral spore (extracellular)",
+        "description": "Dormant viral form with enhanced resistance",
+        "base_degradation_rate": 0.02,
+        "location": LOCATION_EXTRACELLULAR,
+        "entity_class": ENTITY_CLASS_VIRION,
+        "is_starter": True
+    },
+    "virion in endosome (cytoplasm)": {
+        "name": "virion in endosome (cytoplasm)",
+        "description": "Viral particle inside cellular endosome",
+        "base_degradation_rate": 0.03,
+        "location": LOCATION_ENDOSOME,
+        "entity_class": ENTITY_CLASS_VIRION,
+        "is_starter": False
+    },
+    "viral polymerase (cytoplasm)": {
+        "name": "viral polymerase (cytoplasm)",
+        "description": "Viral RNA polymerase enzyme",
+        "base_degradation_rate": 0.08,
+        "location": LOCATION_CYTOPLASM,
+        "entity_class": ENTITY_CLASS_PROTEIN,
+        "is_starter": False
+    },
+    "viral RNA (cytoplasm)": {
+        "name": "viral RNA (cytoplasm)",
+        "description": "Viral genetic material",
+        "base_degradation_rate": 0.12,
+        "location": LOCATION_CYTOPLASM,
+        "entity_class": ENTITY_CLASS_RNA,
+        "is_starter": False
+    },
+    "mature viral proteins (cytoplasm)": {
+        "name": "mature viral proteins (cytoplasm)",
+        "description": "Processed viral proteins ready for assembly",
+        "base_degradation_rate": 0.06,
+        "location": LOCATION_CYTOPLASM,
+        "entity_class": ENTITY_CLASS_PROTEIN,
+        "is_starter": False
+    }
+}
+
+_SAMPLE_GENES = {
+    "Basic Capsid": {
+        "name": "Basic Capsid",
+        "cost": 0,
+        "description": "Basic viral capsid protein. Provides structural integrity.",
+        "effects": [],
+        "is_polymerase": False
+    },
+    "Glycoprotein S1": {
+        "name": "Glycoprotein S1",
+        "cost": 50,
+        "description": "Surface protein enabling receptor binding and endocytosis",
+        "effects": [
+            {
+                "type": "add_transition",
+                "rule": {
+                    "name": "Receptor-mediated endocytosis",
+                    "inputs": [
+                        {"entity": "unenveloped virion (extracellular)", "count": 1, "consumed": True}
+                    ],
+                    "outputs": [
+                        {"entity": "virion in endosome (cytoplasm)", "count": 1}
+                    ],
+                    "probability": 0.3,
+                    "rule_type": "per_entity"
+                }
+            }
+        ],
+        "is_polymerase": False
+    },
+    "RNA-dependent RNA polymerase": {
+        "name": "RNA-dependent RNA polymerase",
+        "cost": 80,
+        "description": "Enzyme enabling viral RNA replication",
+        "effects": [
+            {
+                "type": "add_transition",
+                "rule": {
+                    "name": "RNA replication",
+                    "inputs": [
+                        {"entity": "viral polymerase (cytoplasm)", "count": 1, "consumed": False},
+                        {"entity": "viral RNA (cytoplasm)", "count": 1, "consumed": False}
+                    ],
+                    "outputs": [
+                        {"entity": "viral RNA (cytoplasm)", "count": 1}
+                    ],
+                    "probability": 0.7,
+                    "rule_type": "per_pair"
+                }
+            }
+        ],
+        "is_polymerase": True
+    },
+    "Membrane fusion protein": {
+        "name": "Membrane fusion protein",
+        "cost": 60,
+        "description": "Protein that enables escape from endosomes",
+        "requires": ["Glycoprotein S1"],
+        "effects": [
+            {
+                "type": "add_transition",
+                "rule": {
+                    "name": "Endosome escape",
+                    "inputs": [
+                        {"entity": "virion in endosome (cytoplasm)", "count": 1, "consumed": True}
+                    ],
+                    "outputs": [
+                        {"entity": "viral RNA (cytoplasm)", "count": 2},
+                        {"entity": "viral polymerase (cytoplasm)", "count": 1}
+                    ],
+                    "probability": 0.8,
+                    "rule_type": "per_entity"
+                }
+            }
+        ],
+        "is_polymerase": False
+    }
+}
+
+_SAMPLE_MILESTONES = {
+    "survivor_5": {
+        "id": "survivor_5",
+        "name": "Basic Survival",
+        "description": "Keep your virus alive for at least 5 turns",
+        "type": "survive_turns",
+        "target": 5,
+        "reward_ep": 25
+    },
+    "survivor_15": {
+        "id": "survivor_15",
+        "name": "Extended Survival",
+        "description": "Keep your virus alive for at least 15 turns",
+        "type": "survive_turns",
+        "target": 15,
+        "reward_ep": 75
+    },
+    "protein_peak_10": {
+        "id": "protein_peak_10",
+        "name": "Protein Factory",
+        "description": "Have 10 protein entities present simultaneously",
+        "type": "peak_entity_count",
+        "entity_class": ENTITY_CLASS_PROTEIN,
+        "target": 10,
+        "reward_ep": 50
+    }
+}
+
+# (lowercase substring, result) pairs scanned in order by the name guessers
+_LOCATION_GUESS_TABLE = (
+    ("(extracellular)", LOCATION_EXTRACELLULAR),
+    ("(cytoplasm)", LOCATION_CYTOPLASM),
+    ("(endosome)", LOCATION_ENDOSOME),
+    ("(nucleus)", LOCATION_NUCLEUS),
+)
+_CLASS_GUESS_TABLE = (
+    ("rna", ENTITY_CLASS_RNA),
+    ("protein", ENTITY_CLASS_PROTEIN),
+    ("polymerase", ENTITY_CLASS_PROTEIN),
+    ("protease", ENTITY_CLASS_PROTEIN),
+    ("virion", ENTITY_CLASS_VIRION),
 )
 
 
 class GeneDatabaseManager:
     """Manages loading, saving, and editing gene databases."""
 
+    __slots__ = (
+        "database",
+        "file_path",
+        "is_modified",
+        "_json_parser",
+        "_starter_entities",
+        "_polymerase_genes",
+        "_entity_classes",
+        "_requires_index",
+        "_gene_references",
+        "_referenced_entities",
+        "_gene_names",
+    )
+
+    # Validated databases keyed by (device, inode, mtime_ns, size), shared
+    # across managers so reloading an unchanged file skips parse+validation
+    _load_cache: "OrderedDict[Tuple[int, int, int, int], Dict]" = OrderedDict()
+    _LOAD_CACHE_SIZE = 4
+
     def __init__(self):
+        timestamp = _iso_now()
         self.database = {
             "database_info": {
                 "name": DATABASE_DEFAULT_NAME,
                 "version": DATABASE_VERSION,
                 "description": "",
                 "created_by": "User",
-                "created_date": datetime.now().isoformat(),
-                "last_modified": datetime.now().isoformat()
+                "created_date": timestamp,
+                "last_modified": timestamp
             },
             "entities": {
-                DEFAULT_BASE_ENTITY_NAME: {
-                    "name": DEFAULT_BASE_ENTITY_NAME,
-                    "description": "Basic viral particle outside the cell",
-                    "base_degradation_rate": DEFAULT_DEGRADATION_RATE,
-                    "location": LOCATION_EXTRACELLULAR,
-                    "entity_class": ENTITY_CLASS_VIRION,
-                    "is_starter": True
-                }
+                DEFAULT_BASE_ENTITY_NAME: _BASE_ENTITY_TEMPLATE.copy()
             },
             "genes": {},
             "milestones": {}
         }
         self.file_path: Optional[str] = None
         self.is_modified = False
+        # Reused across loads so simdjson keeps its internal buffer
+        self._json_parser = simdjson.Parser() if simdjson is not None else None
+
+        # Side indexes kept in step with add/delete; dicts act as ordered sets
+        # so results follow database order like the full scans did
+        self._starter_entities: Dict[str, None] = {}
+        self._polymerase_genes: Dict[str, None] = {}
+        self._entity_classes: Counter = Counter()
+        # Lazily built prerequisite index, dropped whenever genes change
+        self._requires_index: Optional[Tuple[List[str], Dict[str, List[str]], Dict[str, int]]] = None
+        # Per-gene snapshot of referenced entities (effects lists are edited
+        # in place, so the old refs can't be recomputed) and their totals
+        self._gene_references: Dict[str, Tuple[str, ...]] = {}
+        self._referenced_entities: Counter = Counter()
+        # Gene names in database order, built on first use and dropped
+        # whenever a gene is added or removed
+        self._gene_names: Optional[Tuple[str, ...]] = None
+        self._rebuild_indexes()
 
     def load_database(self, file_path: str) -> bool:
         """Load database from JSON file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                loaded_data = json.load(f)
+            st = os.stat(file_path)
+            cache_key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+            cached = self._load_cache.get(cache_key)
+            if cached is not None:
+                self._load_cache.move_to_end(cache_key)
+                self._set_loaded_database(copy.deepcopy(cached), file_path)
+                return True
+
+            loaded_data = self._parse_database_file(file_path)
 
             if not self._validate_database_structure(loaded_data):
                 raise ValueError("Invalid database structure")
+            self._normalize_loaded_data(loaded_data)
 
-            self.database = loaded_data
-            self.file_path = file_path
-            self.is_modified = False
-            self._ensure_base_entity()
-            self._ensure_milestones_section()
-            self._migrate_genes_add_polymerase_field(loaded_data)
+            self._load_cache[cache_key] = copy.deepcopy(loaded_data)
+            if len(self._load_cache) > self._LOAD_CACHE_SIZE:
+                self._load_cache.popitem(last=False)
+
+            self._set_loaded_database(loaded_data, file_path)
             return True
 
         except Exception as e:
             raise Exception(f"Failed to load database: {e}")
 
-    def save_database(self, file_path: Optional[str] = None) -> bool:
-        """Save database to JSON file."""
+    def _parse_database_file(self, file_path: str) -> Any:
+        """
+        Parse a database file with the fastest available parser.
+
+        The fast parsers reject the NaN/Infinity tokens json.dump writes for
+        non-finite floats, so such files are parsed again with the stdlib.
+        """
+        if self._json_parser is None and orjson is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+
+        if self._json_parser is not None:
+            try:
+                doc = self._json_parser.parse(raw)
+            except ValueError:
+                doc = None
+            if doc is not None:
+                # Check top-level sections on the lazy document before
+                # materializing the full tree
+                if not (isinstance(doc, simdjson.Object)
+                        and all(key in doc for key in _REQUIRED_DATABASE_KEYS)):
+                    raise ValueError("Invalid database structure")
+                return doc.as_dict()
+        else:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass
+
+        return json.loads(raw.decode('utf-8'))
+
+    def _set_loaded_database(self, loaded_data: Dict, file_path: str):
+        """Install validated data as the current database."""
+        self.database = loaded_data
+        self.file_path = file_path
+        self.is_modified = False
+        self._rebuild_indexes()
+
+    # =================== SIDE INDEXES ===================
+
+    def _rebuild_indexes(self):
+        """Rebuild starter/polymerase/class indexes from the whole database."""
+        entities = self.database["entities"]
+        self._starter_entities = {
+            name: None for name, entity_data in entities.items() if entity_data.get("is_starter", False)
+        }
+        self._polymerase_genes = {
+            name: None for name, gene_data in self.database["genes"].items()
+            if gene_data.get("is_polymerase", False)
+        }
+        self._entity_classes = Counter(
+            entity_data.get("entity_class", ENTITY_CLASS_UNKNOWN) for entity_data in entities.values()
+        )
+        self._requires_index = None
+        self._gene_names = None
+        self._gene_references = {
+            name: _collect_referenced_entities(gene_data) for name, gene_data in self.database["genes"].items()
+        }
+        self._referenced_entities = Counter()
+        for references in self._gene_references.values():
+            self._referenced_entities.update(references)
+
+    def _update_gene_references(self, gene_name: str, new_data: Optional[Dict]):
+        """Swap one gene's entity references in the reference counts."""
+        referenced = self._referenced_entities
+        for entity_name in self._gene_references.pop(gene_name, _EMPTY):
+            referenced[entity_name] -= 1
+            if referenced[entity_name] <= 0:
+                del referenced[entity_name]
+        if new_data is not None:
+            references = _collect_referenced_entities(new_data)
+            self._gene_references[gene_name] = references
+            referenced.update(references)
+
+    def get_requires_index(self) -> Tuple[List[str], Dict[str, List[str]], Dict[str, int]]:
+        """
+        Get (genes without prerequisites, prerequisite -> dependent genes,
+        gene -> database position), building it on first use.
+        """
+        if self._requires_index is None:
+            no_requires = []
+            dependents: Dict[str, List[str]] = {}
+            positions = {}
+            for position, (gene_name, gene_data) in enumerate(self.database["genes"].items()):
+                positions[gene_name] = position
+                requires = gene_data.get("requires")
+                if requires:
+                    for req in requires:
+                        dependents.setdefault(req, []).append(gene_name)
+                else:
+                    no_requires.append(gene_name)
+            self._requires_index = (no_requires, dependents, positions)
+        return self._requires_index
+
+    def _update_entity_indexes(self, entity_name: str, old_data: Optional[Dict], new_data: Optional[Dict]):
+        """Apply one entity insert/update/delete to the side indexes."""
+        if old_data is not None:
+            self._entity_classes[old_data.get("entity_class", ENTITY_CLASS_UNKNOWN)] -= 1
+        if new_data is not None:
+            self._entity_classes[new_data.get("entity_class", ENTITY_CLASS_UNKNOWN)] += 1
+
+        was_starter = old_data is not None and old_data.get("is_starter", False)
+        is_starter = new_data is not None and new_data.get("is_starter", False)
+        if is_starter and not was_starter:
+            if old_data is None:
+                # New keys are appended to the entities dict, so order holds
+                self._starter_entities[entity_name] = None
+            else:
+                self._starter_entities = {
+                    name: None for name, entity_data in self.database["entities"].items()
+                    if entity_data.get("is_starter", False)
+                }
+        elif was_starter and not is_starter:
+            self._starter_entities.pop(entity_name, None)
+
+    def _update_gene_indexes(self, gene_name: str, old_data: Optional[Dict], new_data: Optional[Dict]):
+        """Apply one gene insert/update/delete to the side indexes."""
+        was_polymerase = old_data is not None and old_data.get("is_polymerase", False)
+        is_polymerase = new_data is not None and new_data.get("is_polymerase", False)
+        if is_polymerase and not was_polymerase:
+            if old_data is None:
+                self._polymerase_genes[gene_name] = None
+            else:
+                self._polymerase_genes = {
+                    name: None for name, gene_data in self.database["genes"].items()
+                    if gene_data.get("is_polymerase", False)
+                }
+        elif was_polymerase and not is_polymerase:
+            self._polymerase_genes.pop(gene_name, None)
+
+    def save_database(self, file_path: Optional[str] = None, durable: bool = False) -> bool:
+        """Save database to JSON file (fsync before close when durable)."""
+        return self._write_database(file_path, lambda: (self._serialize_database(),), durable)
+
+    def save_database_streaming(
+            self, file_path: Optional[str] = None, bytes_per_sync: int = 1 << 20, durable: bool = False
+    ) -> bool:
+        """
+        Save database to JSON file without building the whole payload in
+        memory, flushing in bounded chunks and syncing every bytes_per_sync.
+        """
+        def encode_chunks():
+            for piece in _DATABASE_ENCODER.iterencode(self.database):
+                yield piece.encode('utf-8')
+
+        return self._write_database(file_path, encode_chunks, durable, bytes_per_sync)
+
+    def _write_database(
+            self,
+            file_path: Optional[str],
+            make_chunks: Callable[[], Iterable[bytes]],
+            durable: bool,
+            bytes_per_sync: int = 0
+    ) -> bool:
+        """Write serialized chunks to a temp file and atomically swap it in."""
         save_path = file_path or self.file_path
         if not save_path:
             raise ValueError("No file path specified")
 
-        self.database["database_info"]["last_modified"] = datetime.now().isoformat()
+        self.database["database_info"]["last_modified"] = _iso_now()
 
         try:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(self.database, f, indent=2, ensure_ascii=False)
+            # Write to a sibling temp file and swap it in, so a failed save
+            # leaves the previous file intact. Swap in beside the real file,
+            # so a symlinked path keeps its link, and keep the file's mode.
+            target_path = os.path.realpath(save_path)
+            try:
+                target_mode = stat.S_IMODE(os.stat(target_path).st_mode)
+            except FileNotFoundError:
+                target_mode = None
+            tmp_path = f"{target_path}.tmp.{os.getpid()}"
+            try:
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    if target_mode is not None:
+                        _fchmod(fd, tmp_path, target_mode)
+                    buffer = bytearray()
+                    unsynced = 0
+                    for chunk in make_chunks():
+                        if buffer or len(chunk) < _WRITE_BUFFER_SIZE:
+                            buffer += chunk
+                            if len(buffer) < _WRITE_BUFFER_SIZE:
+                                continue
+                            chunk = buffer
+                        _write_all(fd, chunk)
+                        unsynced += len(chunk)
+                        buffer = bytearray()
+                        if bytes_per_sync and unsynced >= bytes_per_sync:
+                            _fdatasync(fd)
+                            unsynced = 0
+                    if buffer:
+                        _write_all(fd, buffer)
+                    if durable:
+                        os.fsync(fd)
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, target_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            if durable and hasattr(os, "O_DIRECTORY"):
+                dir_fd = os.open(os.path.dirname(target_path), os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+
             self.file_path = save_path
             self.is_modified = False
             return True
         except Exception as e:
             raise Exception(f"Failed to save database: {e}")
 
+    def _serialize_database(self) -> bytes:
+        """Serialize the database to UTF-8 JSON bytes in one piece."""
+        # orjson only when its output is the stdlib's; anything else (inf/nan,
+        # huge ints, exponent-form floats) keeps the stdlib encoding
+        if orjson is not None and _orjson_matches_stdlib(self.database):
+            try:
+                return orjson.dumps(self.database, option=orjson.OPT_INDENT_2)
+            except orjson.JSONEncodeError:
+                pass
+        return _DATABASE_ENCODER.encode(self.database).encode('utf-8')
+
     def _validate_database_structure(self, data: Dict) -> bool:
         """Validate that the loaded data has the expected structure."""
         try:
-            required_keys = ["database_info", "genes", "entities"]
-            if not all(key in data for key in required_keys):
+            if not all(key in data for key in _REQUIRED_DATABASE_KEYS):
                 return False
 
             info_keys = ["name", "version", "created_date", "last_modified"]
@@ -110,23 +653,29 @@ class GeneDatabaseManager:
             elif not isinstance(data["entities"], dict):
                 return False
 
-            self._migrate_entities_add_starter_field(data)
-            self._migrate_genes_add_polymerase_field(data)
-
-            if "milestones" not in data:
-                data["milestones"] = {}
-            elif not isinstance(data["milestones"], dict):
-                data["milestones"] = {}
-
             return True
         except:
             return False
 
-    def _ensure_milestones_section(self):
-        """Ensure milestones section exists in database."""
-        if "milestones" not in self.database:
-            self.database["milestones"] = {}
-            self.is_modified = True
+    def _normalize_loaded_data(self, data: Dict):
+        """
+        Fill in defaults for validated data in a single pass per section:
+        is_starter on entities, is_polymerase on genes, the base entity and
+        the milestones section.
+        """
+        entities = data["entities"]
+        for entity_name, entity_data in entities.items():
+            if "is_starter" not in entity_data:
+                entity_data["is_starter"] = (entity_name == DEFAULT_BASE_ENTITY_NAME)
+        if DEFAULT_BASE_ENTITY_NAME not in entities:
+            entities[DEFAULT_BASE_ENTITY_NAME] = _BASE_ENTITY_TEMPLATE.copy()
+
+        for gene_data in data["genes"].values():
+            if "is_polymerase" not in gene_data:
+                gene_data["is_polymerase"] = False
+
+        if not isinstance(data.get("milestones"), dict):
+            data["milestones"] = {}
 
     def _migrate_entities_to_new_format(self, data: Dict):
         """Migrate old entities list format to new entities object format."""
@@ -135,88 +684,55 @@ class GeneDatabaseManager:
             new_entities = {}
 
             for entity_name in old_entities:
+                location, entity_class = self._guess_location_and_class(entity_name)
                 new_entities[entity_name] = {
                     "name": entity_name,
                     "description": f"Auto-migrated entity: {entity_name}",
                     "base_degradation_rate": DEFAULT_DEGRADATION_RATE,
-                    "location": self._guess_location_from_name(entity_name),
-                    "entity_class": self._guess_class_from_name(entity_name),
+                    "location": location,
+                    "entity_class": entity_class,
                     "is_starter": entity_name == DEFAULT_BASE_ENTITY_NAME
                 }
 
             data["entities"] = new_entities
 
-    def _migrate_entities_add_starter_field(self, data: Dict):
-        """Add is_starter field to entities that don't have it."""
-        if "entities" in data and isinstance(data["entities"], dict):
-            for entity_name, entity_data in data["entities"].items():
-                if "is_starter" not in entity_data:
-                    entity_data["is_starter"] = (entity_name == DEFAULT_BASE_ENTITY_NAME)
-
-    def _migrate_genes_add_polymerase_field(self, data: Dict):
-        """Add is_polymerase field to genes that don't have it."""
-        if "genes" in data and isinstance(data["genes"], dict):
-            modified = False
-            for gene_name, gene_data in data["genes"].items():
-                if "is_polymerase" not in gene_data:
-                    gene_data["is_polymerase"] = False
-                    modified = True
-            if modified:
-                self.is_modified = True
-
     def _guess_location_from_name(self, entity_name: str) -> str:
         """Guess location from entity name."""
         name_lower = entity_name.lower()
-        if "(extracellular)" in name_lower:
-            return LOCATION_EXTRACELLULAR
-        elif "(cytoplasm)" in name_lower:
-            return LOCATION_CYTOPLASM
-        elif "(endosome)" in name_lower:
-            return LOCATION_ENDOSOME
-        elif "(nucleus)" in name_lower:
-            return LOCATION_NUCLEUS
-        else:
-            return "unknown"
+        return next((loc for sub, loc in _LOCATION_GUESS_TABLE if sub in name_lower), LOCATION_UNKNOWN)
 
     def _guess_class_from_name(self, entity_name: str) -> str:
         """Guess entity class from name."""
         name_lower = entity_name.lower()
-        if "rna" in name_lower:
-            return ENTITY_CLASS_RNA
-        elif any(term in name_lower for term in ["protein", "polymerase", "protease"]):
-            return ENTITY_CLASS_PROTEIN
-        elif "virion" in name_lower:
-            return ENTITY_CLASS_VIRION
-        else:
-            return "unknown"
-
-    def _ensure_base_entity(self):
-        """Ensure the base entity exists."""
-        if DEFAULT_BASE_ENTITY_NAME not in self.database["entities"]:
-            self.database["entities"][DEFAULT_BASE_ENTITY_NAME] = {
-                "name": DEFAULT_BASE_ENTITY_NAME,
-                "description": "Basic viral particle outside the cell",
-                "base_degradation_rate": DEFAULT_DEGRADATION_RATE,
-                "location": LOCATION_EXTRACELLULAR,
-                "entity_class": ENTITY_CLASS_VIRION,
-                "is_starter": True
-            }
+        return next((cls for sub, cls in _CLASS_GUESS_TABLE if sub in name_lower), ENTITY_CLASS_UNKNOWN)
+
+    def _guess_location_and_class(self, entity_name: str) -> Tuple[str, str]:
+        """Guess both location and class, lowercasing the name only once."""
+        name_lower = entity_name.lower()
+        location = next((loc for sub, loc in _LOCATION_GUESS_TABLE if sub in name_lower), LOCATION_UNKNOWN)
+        entity_class = next((cls for sub, cls in _CLASS_GUESS_TABLE if sub in name_lower), ENTITY_CLASS_UNKNOWN)
+        return location, entity_class
 
     # =================== ENTITY MANAGEMENT ===================
 
-    def add_entity(self, entity_data: Dict):
-        """Add or update an entity."""
-        entity_name = entity_data["name"]
+    def add_entity(self, entity_data: Dict, *, copy: bool = True):
+        """Add or update an entity (copy=False stores the caller's dict as-is)."""
+        if copy:
+            entity_data = entity_data.copy()
         if "is_starter" not in entity_data:
             entity_data["is_starter"] = False
 
-        self.database["entities"][entity_name] = entity_data.copy()
+        entity_name = entity_data["name"]
+        old_data = self.database["entities"].get(entity_name)
+        self.database["entities"][entity_name] = entity_data
+        self._update_entity_indexes(entity_name, old_data, entity_data)
         self.is_modified = True
 
     def delete_entity(self, entity_name: str):
         """Delete an entity."""
         if entity_name in self.database["entities"]:
-            del self.database["entities"][entity_name]
+            old_data = self.database["entities"].pop(entity_name)
+            self._update_entity_indexes(entity_name, old_data, None)
             self.is_modified = True
 
     def get_entity(self, entity_name: str) -> Optional[Dict]:
@@ -227,17 +743,13 @@ class GeneDatabaseManager:
         """Get all entity names."""
         return list(self.database["entities"].keys())
 
-    def get_entities(self) -> Dict:
-        """Get all entities as a dict."""
-        return self.database["entities"].copy()
+    def get_entities(self) -> Mapping[str, Dict]:
+        """Get a read-only view of all entities (copy it to mutate)."""
+        return MappingProxyType(self.database["entities"])
 
     def get_starter_entities(self) -> List[str]:
         """Get all entities marked as starter entities."""
-        starter_entities = []
-        for entity_name, entity_data in self.database["entities"].items():
-            if entity_data.get("is_starter", False):
-                starter_entities.append(entity_name)
-        return starter_entities
+        return list(self._starter_entities)
 
     def get_starter_entity_names(self) -> List[str]:
         """Get names of all starter entities (alias for compatibility)."""
@@ -246,89 +758,109 @@ class GeneDatabaseManager:
     def set_entity_starter_status(self, entity_name: str, is_starter: bool) -> bool:
         """Set the starter status of an entity."""
         if entity_name in self.database["entities"]:
-            self.database["entities"][entity_name]["is_starter"] = bool(is_starter)
+            entity_data = self.database["entities"][entity_name]
+            old_data = entity_data.copy()
+            entity_data["is_starter"] = bool(is_starter)
+            self._update_entity_indexes(entity_name, old_data, entity_data)
             self.is_modified = True
             return True
         return False
 
     # =================== GENE MANAGEMENT ===================
 
-    def add_gene(self, gene_data: Dict):
-        """Add or update a gene."""
-        gene_name = gene_data["name"]
-
-        if "is_polymerase" not in gene_data:
-            gene_data["is_polymerase"] = False
+    def add_gene(self, gene_data: Dict, *, copy: bool = True):
+        """Add or update a gene (copy=False stores the caller's dict as-is)."""
+        self._store_gene(gene_data, copy)
+        self._update_entities_from_genes()
+        self.is_modified = True
 
-        self.database["genes"][gene_name] = gene_data.copy()
+    def bulk_add_genes(self, genes: List[Dict]):
+        """Add or update many caller-owned genes, syncing entities once."""
+        for gene_data in genes:
+            self._store_gene(gene_data, False)
         self._update_entities_from_genes()
         self.is_modified = True
 
+    def _store_gene(self, gene_data: Dict, copy: bool):
+        """Insert a gene dict, defaulting its is_polymerase field."""
+        if copy:
+            gene_data = gene_data.copy()
+        if "is_polymerase" not in gene_data:
+            gene_data["is_polymerase"] = False
+        gene_name = gene_data["name"]
+        old_data = self.database["genes"].get(gene_name)
+        self.database["genes"][gene_name] = gene_data
+        if old_data is None:
+            self._gene_names = None
+        self._update_gene_indexes(gene_name, old_data, gene_data)
+        self._update_gene_references(gene_name, gene_data)
+        self._requires_index = None
+
     def delete_gene(self, gene_name: str):
         """Delete a gene."""
         if gene_name in self.database["genes"]:
-            del self.database["genes"][gene_name]
+            old_data = self.database["genes"].pop(gene_name)
+            self._gene_names = None
+            self._update_gene_indexes(gene_name, old_data, None)
+            self._update_gene_references(gene_name, None)
+            self._requires_index = None
             self._update_entities_from_genes()
             self.is_modified = True
 
     def get_gene(self, gene_name: str) -> Optional[Dict]:
         """Get a gene by name."""
-        gene_data = self.database["genes"].get(gene_name)
-        if gene_data and "is_polymerase" not in gene_data:
-            gene_data["is_polymerase"] = False
-        return gene_data
+        # is_polymerase is guaranteed by load normalization and _store_gene
+        return self.database["genes"].get(gene_name)
+
+    def get_genes(self, gene_names: Iterable[str]) -> Dict[str, Dict]:
+        """Get several genes by name in one pass (unknown names are skipped)."""
+        genes = self.database["genes"]
+        return {name: genes[name] for name in gene_names if name in genes}
 
     def get_all_genes(self) -> List[str]:
         """Get all gene names."""
         return list(self.database["genes"].keys())
 
+    def get_all_genes_cached(self) -> Tuple[str, ...]:
+        """Get all gene names as a shared tuple, rebuilt only after genes are added or removed."""
+        if self._gene_names is None:
+            self._gene_names = tuple(self.database["genes"])
+        return self._gene_names
+
     def get_polymerase_genes(self) -> List[str]:
         """Get all genes marked as polymerase genes."""
-        polymerase_genes = []
-        for gene_name, gene_data in self.database["genes"].items():
-            if gene_data.get("is_polymerase", False):
-                polymerase_genes.append(gene_name)
-        return polymerase_genes
+        return list(self._polymerase_genes)
 
     def is_polymerase_gene(self, gene_name: str) -> bool:
         """Check if a gene is marked as a polymerase gene."""
-        gene_data = self.database["genes"].get(gene_name)
-        if gene_data:
-            return gene_data.get("is_polymerase", False)
-        return False
+        return self.database["genes"].get(gene_name, {}).get("is_polymerase", False)
 
     def _update_entities_from_genes(self):
         """Update entities list based on genes (for backwards compatibility)."""
-        referenced_entities = set()
-
-        for gene in self.database["genes"].values():
-            for effect in gene.get("effects", []):
-                if effect["type"] == "enable_entity":
-                    referenced_entities.add(effect["entity"])
-                elif effect["type"] in ["add_transition"]:
-                    rule = effect["rule"]
-                    for input_spec in rule["inputs"]:
-                        referenced_entities.add(input_spec["entity"])
-                    for output_spec in rule["outputs"]:
-                        referenced_entities.add(output_spec["entity"])
-
-        for entity_name in referenced_entities:
-            if entity_name not in self.database["entities"]:
-                self.database["entities"][entity_name] = {
-                    "name": entity_name,
-                    "description": f"Auto-generated entity: {entity_name}",
-                    "base_degradation_rate": DEFAULT_DEGRADATION_RATE,
-                    "location": self._guess_location_from_name(entity_name),
-                    "entity_class": self._guess_class_from_name(entity_name),
-                    "is_starter": False
-                }
+        entities = self.database["entities"]
+
+        # Reference counts are maintained by _store_gene/delete_gene, so only
+        # entities that are not defined yet need a guessed entry
+        missing = [name for name in self._referenced_entities if name not in entities]
+        for entity_name in missing:
+            location, entity_class = self._guess_location_and_class(entity_name)
+            entities[entity_name] = {
+                "name": entity_name,
+                "description": f"Auto-generated entity: {entity_name}",
+                "base_degradation_rate": DEFAULT_DEGRADATION_RATE,
+                "location": location,
+                "entity_class": entity_class,
+                "is_starter": False
+            }
+            self._entity_classes[entity_class] += 1
 
     # =================== MILESTONE MANAGEMENT ===================
 
-    def add_milestone(self, milestone_data: Dict):
-        """Add or update a milestone."""
-        milestone_id = milestone_data["id"]
-        self.database["milestones"][milestone_id] = milestone_data.copy()
+    def add_milestone(self, milestone_data: Dict, *, copy: bool = True):
+        """Add or update a milestone (copy=False stores the caller's dict as-is)."""
+        if copy:
+            milestone_data = milestone_data.copy()
+        self.database["milestones"][milestone_data["id"]] = milestone_data
         self.is_modified = True
 
     def delete_milestone(self, milestone_id: str):
@@ -345,21 +877,29 @@ class GeneDatabaseManager:
         """Get all milestone IDs."""
         return list(self.database["milestones"].keys())
 
-    def get_milestones(self) -> Dict:
-        """Get all milestones as a dict."""
-        return self.database["milestones"].copy()
+    def get_milestones(self) -> Mapping[str, Dict]:
+        """Get a read-only view of all milestones (copy it to mutate)."""
+        return MappingProxyType(self.database["milestones"])
 
     def get_entity_classes(self) -> List[str]:
         """Get all unique entity classes defined in the database."""
-        classes = set()
-        for entity_data in self.database["entities"].values():
-            entity_class = entity_data.get("entity_class", "unknown")
-            if entity_class:
-                classes.add(entity_class)
-        return sorted(list(classes))
+        return sorted(
+            entity_class for entity_class, count in self._entity_classes.items() if entity_class and count > 0
+        )
 
     def validate_milestone_data(self, milestone_data: Dict) -> tuple[bool, str]:
         """Validate milestone data structure and values."""
+        return self._validate_milestone_inner(milestone_data, None)
+
+    def validate_milestones_batch(self, milestones: List[Dict]) -> List[tuple[bool, str]]:
+        """Validate many milestones, computing the entity classes only once."""
+        available_classes = frozenset(self.get_entity_classes())
+        return [self._validate_milestone_inner(milestone_data, available_classes) for milestone_data in milestones]
+
+    def _validate_milestone_inner(
+            self, milestone_data: Dict, available_classes: Optional[frozenset]
+    ) -> tuple[bool, str]:
+        """Validate one milestone; available_classes is computed if None."""
         required_fields = ["id", "name", "description", "type", "target", "reward_ep"]
 
         for field in required_fields:
@@ -367,11 +907,11 @@ class GeneDatabaseManager:
                 return False, f"Missing required field: {field}"
 
         milestone_id = milestone_data["id"]
-        if not milestone_id.replace("_", "").replace("-", "").isalnum():
+        if not _MILESTONE_ID_RE.fullmatch(milestone_id):
             return False, "Milestone ID must contain only letters, numbers, underscores, and hyphens"
 
         if milestone_data["type"] not in VALID_MILESTONE_TYPES:
-            return False, f"Invalid milestone type. Must be one of: {', '.join(VALID_MILESTONE_TYPES)}"
+            return False, f"Invalid milestone type. Must be one of: {', '.join(VALID_MILESTONE_TYPES_ORDER)}"
 
         try:
             target = int(milestone_data["target"])
@@ -387,205 +927,50 @@ class GeneDatabaseManager:
         except (ValueError, TypeError):
             return False, "Reward EP must be a valid non-negative integer"
 
-        if milestone_data["type"] in ["peak_entity_count", "cumulative_entity_count"]:
+        if milestone_data["type"] in _COUNT_MILESTONE_TYPES:
             if "entity_class" not in milestone_data:
                 return False, "Entity count milestones must specify an entity_class"
 
-            available_classes = self.get_entity_classes()
+            if available_classes is None:
+                available_classes = frozenset(self.get_entity_classes())
             if milestone_data["entity_class"] not in available_classes:
-                return False, f"Invalid entity_class. Available classes: {', '.join(available_classes)}"
+                return False, f"Invalid entity_class. Available classes: {', '.join(sorted(available_classes))}"
 
         return True, "Valid milestone data"
 
     def create_sample_database(self):
         """Create a sample database with example genes and milestones."""
+        timestamp = _iso_now()
         self.database = {
             "database_info": {
                 "name": "Sample Virus Gene Database",
                 "version": DATABASE_VERSION,
                 "description": "Sample database with basic viral genes and milestones",
                 "created_by": "Virus Sandbox",
-                "created_date": datetime.now().isoformat(),
-                "last_modified": datetime.now().isoformat()
-            },
-            "entities": {
-                "unenveloped virion (extracellular)": {
-                    "name": "unenveloped virion (extracellular)",
-                    "description": "Basic viral particle outside the cell",
-                    "base_degradation_rate": 0.05,
-                    "location": LOCATION_EXTRACELLULAR,
-                    "entity_class": ENTITY_CLASS_VIRION,
-                    "is_starter": True
-                },
-                "enveloped virion (extracellular)": {
-                    "name": "enveloped virion (extracellular)",
-                    "description": "Viral particle with lipid envelope",
-                    "base_degradation_rate": 0.08,
-                    "location": LOCATION_EXTRACELLULAR,
-                    "entity_class": ENTITY_CLASS_VIRION,
-                    "is_starter": True
-                },
-                "viral spore (extracellular)": {
-                    "name": "viral spore (extracellular)",
-                    "description": "Dormant viral form with enhanced resistance",
-                    "base_degradation_rate": 0.02,
-                    "location": LOCATION_EXTRACELLULAR,
-                    "entity_class": ENTITY_CLASS_VIRION,
-                    "is_starter": True
-                },
-                "virion in endosome (cytoplasm)": {
-                    "name": "virion in endosome (cytoplasm)",
-                    "description": "Viral particle inside cellular endosome",
-                    "base_degradation_rate": 0.03,
-                    "location": LOCATION_ENDOSOME,
-                    "entity_class": ENTITY_CLASS_VIRION,
-                    "is_starter": False
-                },
-                "viral polymerase (cytoplasm)": {
-                    "name": "viral polymerase (cytoplasm)",
-                    "description": "Viral RNA polymerase enzyme",
-                    "base_degradation_rate": 0.08,
-                    "location": LOCATION_CYTOPLASM,
-                    "entity_class": ENTITY_CLASS_PROTEIN,
-                    "is_starter": False
-                },
-                "viral RNA (cytoplasm)": {
-                    "name": "viral RNA (cytoplasm)",
-                    "description": "Viral genetic material",
-                    "base_degradation_rate": 0.12,
-                    "location": LOCATION_CYTOPLASM,
-                    "entity_class": ENTITY_CLASS_RNA,
-                    "is_starter": False
-                },
-                "mature viral proteins (cytoplasm)": {
-                    "name": "mature viral proteins (cytoplasm)",
-                    "description": "Processed viral proteins ready for assembly",
-                    "base_degradation_rate": 0.06,
-                    "location": LOCATION_CYTOPLASM,
-                    "entity_class": ENTITY_CLASS_PROTEIN,
-                    "is_starter": False
-                }
+                "created_date": timestamp,
+                "last_modified": timestamp
             },
+            "entities": copy.deepcopy(_SAMPLE_ENTITIES),
             "genes": self._create_sample_genes(),
             "milestones": self._create_sample_milestones()
         }
+        self._rebuild_indexes()
         self.is_modified = True
 
     def _create_sample_genes(self) -> Dict:
         """Create sample gene definitions."""
-        return {
-            "Basic Capsid": {
-                "name": "Basic Capsid",
-                "cost": 0,
-                "description": "Basic viral capsid protein. Provides structural integrity.",
-                "effects": [],
-                "is_polymerase": False
-            },
-            "Glycoprotein S1": {
-                "name": "Glycoprotein S1",
-                "cost": 50,
-                "description": "Surface protein enabling receptor binding and endocytosis",
-                "effects": [
-                    {
-                        "type": "add_transition",
-                        "rule": {
-                            "name": "Receptor-mediated endocytosis",
-                            "inputs": [
-                                {"entity": "unenveloped virion (extracellular)", "count": 1, "consumed": True}
-                            ],
-                            "outputs": [
-                                {"entity": "virion in endosome (cytoplasm)", "count": 1}
-                            ],
-                            "probability": 0.3,
-                            "rule_type": "per_entity"
-                        }
-                    }
-                ],
-                "is_polymerase": False
-            },
-            "RNA-dependent RNA polymerase": {
-                "name": "RNA-dependent RNA polymerase",
-                "cost": 80,
-                "description": "Enzyme enabling viral RNA replication",
-                "effects": [
-                    {
-                        "type": "add_transition",
-                        "rule": {
-                            "name": "RNA replication",
-                            "inputs": [
-                                {"entity": "viral polymerase (cytoplasm)", "count": 1, "consumed": False},
-                                {"entity": "viral RNA (cytoplasm)", "count": 1, "consumed": False}
-                            ],
-                            "outputs": [
-                                {"entity": "viral RNA (cytoplasm)", "count": 1}
-                            ],
-                            "probability": 0.7,
-                            "rule_type": "per_pair"
-                        }
-                    }
-                ],
-                "is_polymerase": True
-            },
-            "Membrane fusion protein": {
-                "name": "Membrane fusion protein",
-                "cost": 60,
-                "description": "Protein that enables escape from endosomes",
-                "requires": ["Glycoprotein S1"],
-                "effects": [
-                    {
-                        "type": "add_transition",
-                        "rule": {
-                            "name": "Endosome escape",
-                            "inputs": [
-                                {"entity": "virion in endosome (cytoplasm)", "count": 1, "consumed": True}
-                            ],
-                            "outputs": [
-                                {"entity": "viral RNA (cytoplasm)", "count": 2},
-                                {"entity": "viral polymerase (cytoplasm)", "count": 1}
-                            ],
-                            "probability": 0.8,
-                            "rule_type": "per_entity"
-                        }
-                    }
-                ],
-                "is_polymerase": False
-            }
-        }
+        return copy.deepcopy(_SAMPLE_GENES)
 
     def _create_sample_milestones(self) -> Dict:
         """Create sample milestone definitions."""
-        return {
-            "survivor_5": {
-                "id": "survivor_5",
-                "name": "Basic Survival",
-                "description": "Keep your virus alive for at least 5 turns",
-                "type": "survive_turns",
-                "target": 5,
-                "reward_ep": 25
-            },
-            "survivor_15": {
-                "id": "survivor_15",
-                "name": "Extended Survival",
-                "description": "Keep your virus alive for at least 15 turns",
-                "type": "survive_turns",
-                "target": 15,
-                "reward_ep": 75
-            },
-            "protein_peak_10": {
-                "id": "protein_peak_10",
-                "name": "Protein Factory",
-                "description": "Have 10 protein entities present simultaneously",
-                "type": "peak_entity_count",
-                "entity_class": ENTITY_CLASS_PROTEIN,
-                "target": 10,
-                "reward_ep": 50
-            }
-        }
+        return copy.deepcopy(_SAMPLE_MILESTONES)
 
 
 class GeneDatabase:
     """Interface to gene database for virus building."""
 
+    __slots__ = ("db_manager",)
+
     def __init__(self, database_manager: Optional[GeneDatabaseManager] = None):
         self.db_manager = database_manager
 
@@ -610,13 +995,17 @@ class GeneDatabase:
         if not self.db_manager:
             return []
 
-        available = []
-        selected_gene_names = [gene["name"] for gene in selected_genes]
+        selected_gene_names = {gene["name"] for gene in selected_genes}
+        no_requires, dependents, positions = self.db_manager.get_requires_index()
 
-        for gene_name in self.db_manager.get_all_genes():
-            if gene_name in selected_gene_names:
-                continue
+        # Only root genes and dependents of selected genes can be unlocked
+        candidates = set(no_requires)
+        for gene_name in selected_gene_names:
+            candidates.update(dependents.get(gene_name, ()))
+        candidates -= selected_gene_names
 
+        available = []
+        for gene_name in candidates:
             gene_data = self.db_manager.get_gene(gene_name)
             if not gene_data:
                 continue
@@ -625,4 +1014,5 @@ class GeneDatabase:
             if all(req in selected_gene_names for req in requires):
                 available.append(gene_name)
 
-        return available
\ No newline at end of file
+        available.sort(key=positions.__getitem__)
+        return available
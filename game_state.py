@@ -4,7 +4,10 @@ Game State Management
 Central run-level state including EP, deck, cycles, and milestone tracking.
 """
 
-from typing import Optional, List, Dict, Set
+from bisect import bisect_right
+from collections import Counter
+from operator import itemgetter
+from typing import Callable, Optional, List, Dict, FrozenSet, Mapping, Sequence, Set, Tuple
 import random
 
 from constants import (
@@ -18,6 +21,36 @@ from constants import (
     DEFAULT_BASE_ENTITY_NAME,
 )
 
+_WORD_BITS = 64
+_WORD_RANGE = 1 << _WORD_BITS
+_WORD_MASK = _WORD_RANGE - 1
+
+# Sort/search key for (milestone_id, target) bucket entries
+_TARGET = itemgetter(1)
+
+# Rejection draws allowed per requested offer before falling back to a filtered pool
+_MAX_REJECTION_ROUNDS = 8
+
+
+def _batched_randbelow(getrandbits: Callable[[int], int], bounds: List[int], product: int) -> List[int]:
+    """
+    Draw one uniform integer below each bound from a single 64-bit word.
+
+    product is the product of bounds and must not exceed 2**64. Each step
+    multiplies the word by a bound and keeps the high part (Lemire's
+    nearly-divisionless method, batched); a retry is needed only when the
+    leftover low part falls under the bias threshold, which is rare.
+    """
+    while True:
+        word = getrandbits(_WORD_BITS)
+        results = []
+        for bound in bounds:
+            word *= bound
+            results.append(word >> _WORD_BITS)
+            word &= _WORD_MASK
+        if word >= product or word >= (_WORD_RANGE - product) % product:
+            return results
+
 
 class GameState:
     """
@@ -30,13 +63,20 @@ class GameState:
     - Tracks milestone progress and achievements
     """
 
+    # Flat cost for removing any gene
+    _REMOVE_COST = DEFAULT_GENE_REMOVE_COST
+
     def __init__(self, *, offer_size: int = DEFAULT_GENE_OFFER_SIZE, seed: Optional[int] = None):
         # Economy
         self.ep: int = DEFAULT_STARTING_EP
 
         # Deck-building
         self.deck: List[str] = []
+        self._deck_set: Set[str] = set()
         self.installed_genes: List[str] = []
+        self._installed_set: Set[str] = set()
+        # Deck plus installed genes; rebuilt lazily after either changes
+        self._exclusion_cache: Optional[FrozenSet[str]] = None
         self.installs_this_round: int = 0
 
         # Starter entity selection and count
@@ -54,28 +94,68 @@ class GameState:
         # DB access
         self.db_manager = None
 
+        # Gene names and costs from the DB, fetched lazily and dropped on DB changes
+        self._all_gene_names_cache: Optional[Tuple[str, ...]] = None
+        self._all_gene_names_set: frozenset = frozenset()
+        self._gene_cost_cache: Dict[str, int] = {}
+
         # RNG
         self._rng = random.Random(seed)
 
-        # Milestone achievements (persistent across play runs)
-        self.achieved_milestones: Set[str] = set()
+        # Milestone achievements as bitmasks over _milestone_bits: one
+        # persistent across play runs, one for the current play run only
+        self._milestone_bits: Dict[str, int] = {}
+        self._achieved_mask: int = 0
+        self._run_mask: int = 0
 
-        # Milestone achievements for current play run only
-        self.milestones_achieved_this_run: Set[str] = set()
+        # Achieved ids missing from the current definitions, kept so a
+        # reload that brings them back restores their state
+        self._unmapped_achieved: frozenset = frozenset()
+        self._unmapped_run: frozenset = frozenset()
+
+        # Sum of reward_ep over achieved milestones, kept up to date on award
+        self._total_ep_earned: int = 0
 
         # Progress tracking for current play run
         self.current_turn: int = 0
-        self.peak_entity_counts: Dict[str, int] = {}
-        self.cumulative_entity_counts: Dict[str, int] = {}
+        self.peak_entity_counts: Counter = Counter()
+        self.cumulative_entity_counts: Counter = Counter()
+
+        # The UI lists every class's counts; with this off, only classes that
+        # still have pending count milestones are tracked
+        self.track_all_entity_classes: bool = True
+
+        # entity name -> entity_class (None if not in the DB), filled lazily
+        self._entity_class_cache: Dict[str, Optional[str]] = {}
+
+        # Starter entity names, fetched once per DB attachment/change
+        self._starter_entities_cache: Optional[Tuple[str, ...]] = None
 
         # Milestone definitions (loaded from database)
-        self._milestone_definitions: Dict[str, Dict] = {}
+        self._milestone_definitions: Mapping[str, Dict] = {}
+        self._milestone_defs_tuple: Tuple[Dict, ...] = ()
+
+        # Milestones not achieved yet; only these are kept in the buckets
+        self._pending_milestone_ids: Set[str] = set()
+
+        # (milestone_id, target) buckets sorted by target, rebuilt on load
+        self._survival_milestones: List[Tuple[str, int]] = []
+        self._peak_milestones_by_class: Dict[str, List[Tuple[str, int]]] = {}
+        self._cumulative_milestones_by_class: Dict[str, List[Tuple[str, int]]] = {}
+        self._tracked_classes: Set[str] = set()
+
+        # milestone_id -> (current progress, description) for open milestones
+        self._progress_descriptions: Dict[str, Tuple[int, str]] = {}
 
     # =================== WIRING ===================
 
     def set_database_manager(self, db_manager):
         """Set database manager and initialize from it."""
         self.db_manager = db_manager
+        self.invalidate_gene_cache()
+        self._all_gene_names()
+        self._entity_class_cache.clear()
+        self._starter_entities_cache = None
         self._auto_select_starter_entity()
         self._load_milestone_definitions()
 
@@ -84,7 +164,11 @@ class GameState:
         if not self.db_manager:
             return
 
-        available_starters = self.db_manager.get_starter_entities()
+        available_starters = self._starter_entities()
+        selected = self.selected_starter_entity
+        if selected != DEFAULT_BASE_ENTITY_NAME and selected in available_starters:
+            # Keep a valid explicit choice across re-attachments
+            return
         if available_starters:
             self.selected_starter_entity = available_starters[0]
         else:
@@ -94,26 +178,112 @@ class GameState:
 
     def _load_milestone_definitions(self):
         """Load milestone definitions from database."""
+        achieved = self.achieved_milestones
+        achieved_this_run = self.milestones_achieved_this_run
         if not self.db_manager:
             self._milestone_definitions = {}
-            return
-        self._milestone_definitions = self.db_manager.get_milestones()
+        else:
+            self._milestone_definitions = self.db_manager.get_milestones()
+        self._milestone_defs_tuple = tuple(self._milestone_definitions.values())
+
+        # Bits follow definition order; carry achievements over by id
+        self._milestone_bits = {milestone_id: 1 << i for i, milestone_id in enumerate(self._milestone_definitions)}
+        self._achieved_mask, self._unmapped_achieved = self._mask_from_ids(achieved)
+        self._run_mask, self._unmapped_run = self._mask_from_ids(achieved_this_run)
+        self._total_ep_earned = sum(
+            milestone["reward_ep"] for milestone in self._milestones_from_mask(self._achieved_mask)
+        )
+        self._progress_descriptions.clear()
+        self._reset_pending_milestones()
+
+    def _reset_pending_milestones(self):
+        """Recompute the not-yet-achieved milestones and their buckets."""
+        achieved_mask = self._achieved_mask
+        self._pending_milestone_ids = {
+            milestone_id for milestone_id, bit in self._milestone_bits.items() if not achieved_mask & bit
+        }
+        self._build_milestone_buckets()
+
+    def _mask_from_ids(self, milestone_ids: Set[str]) -> Tuple[int, frozenset]:
+        """Split ids into a bitmask over the current definitions and the unmapped rest."""
+        mask = 0
+        unmapped = []
+        for milestone_id in milestone_ids:
+            bit = self._milestone_bits.get(milestone_id)
+            if bit is None:
+                unmapped.append(milestone_id)
+            else:
+                mask |= bit
+        return mask, frozenset(unmapped)
+
+    def _ids_from_mask(self, mask: int) -> Set[str]:
+        """Get the milestone ids whose bits are set in mask."""
+        return {milestone_id for milestone_id, bit in self._milestone_bits.items() if mask & bit}
+
+    @property
+    def achieved_milestones(self) -> Set[str]:
+        """Ids of milestones achieved in this game (a fresh, read-only copy)."""
+        return self._ids_from_mask(self._achieved_mask) | self._unmapped_achieved
+
+    @property
+    def milestones_achieved_this_run(self) -> Set[str]:
+        """Ids of milestones achieved in the current play run (a fresh, read-only copy)."""
+        return self._ids_from_mask(self._run_mask) | self._unmapped_run
+
+    def _build_milestone_buckets(self):
+        """Group pending milestone targets by type (and entity class), sorted by target."""
+        pending = self._pending_milestone_ids
+        survival = []
+        peak_by_class: Dict[str, List[Tuple[str, int]]] = {}
+        cumulative_by_class: Dict[str, List[Tuple[str, int]]] = {}
+
+        for milestone_id, milestone in self._milestone_definitions.items():
+            if milestone_id not in pending:
+                continue
+            milestone_type = milestone["type"]
+            if milestone_type == "survive_turns":
+                survival.append((milestone_id, milestone["target"]))
+                continue
+
+            entity_class = milestone.get("entity_class")
+            if not entity_class:
+                continue
+            if milestone_type == "peak_entity_count":
+                peak_by_class.setdefault(entity_class, []).append((milestone_id, milestone["target"]))
+            elif milestone_type == "cumulative_entity_count":
+                cumulative_by_class.setdefault(entity_class, []).append((milestone_id, milestone["target"]))
+
+        survival.sort(key=_TARGET)
+        for bucket in peak_by_class.values():
+            bucket.sort(key=_TARGET)
+        for bucket in cumulative_by_class.values():
+            bucket.sort(key=_TARGET)
+
+        self._survival_milestones = survival
+        self._peak_milestones_by_class = peak_by_class
+        self._cumulative_milestones_by_class = cumulative_by_class
+        self._tracked_classes = peak_by_class.keys() | cumulative_by_class.keys()
 
     # =================== STARTER ENTITY ===================
 
+    def _starter_entities(self) -> Tuple[str, ...]:
+        """Get the DB's starter entities (cached)."""
+        if self._starter_entities_cache is None:
+            self._starter_entities_cache = tuple(self.db_manager.get_starter_entities())
+        return self._starter_entities_cache
+
     def get_available_starter_entities(self) -> List[str]:
         """Get all entities that can be used as starters."""
         if not self.db_manager:
             return []
-        return self.db_manager.get_starter_entities()
+        return list(self._starter_entities())
 
     def set_starter_entity(self, entity_name: str) -> bool:
         """Set the selected starter entity (with validation)."""
         if not self.db_manager:
             return False
 
-        available_starters = self.get_available_starter_entities()
-        if entity_name in available_starters:
+        if entity_name in self._starter_entities():
             self.selected_starter_entity = entity_name
             return True
         return False
@@ -127,14 +297,13 @@ class GameState:
         if not self.db_manager:
             return False, "No database loaded"
 
-        available_starters = self.get_available_starter_entities()
+        available_starters = self._starter_entities()
         if not available_starters:
             return False, "No starter entities defined in database"
 
         if self.selected_starter_entity not in available_starters:
-            self._auto_select_starter_entity()
-            if self.selected_starter_entity not in available_starters:
-                return False, f"Selected starter '{self.selected_starter_entity}' is not available"
+            # Same fallback _auto_select_starter_entity would pick
+            self.selected_starter_entity = available_starters[0]
 
         return True, "Valid starter entity selected"
 
@@ -144,12 +313,16 @@ class GameState:
         """Get the EP cost to add a gene."""
         if not self.db_manager:
             return 0
-        gene = self.db_manager.get_gene(gene_name)
-        return int(gene.get("cost", 0)) if gene else 0
+        cost = self._gene_cost_cache.get(gene_name)
+        if cost is None:
+            gene = self.db_manager.get_gene(gene_name)
+            cost = int(gene.get("cost", 0)) if gene else 0
+            self._gene_cost_cache[gene_name] = cost
+        return cost
 
     def get_remove_cost(self, gene_name: str) -> int:
         """Get the EP cost to remove a gene."""
-        return DEFAULT_GENE_REMOVE_COST
+        return self._REMOVE_COST
 
     # =================== EP MANAGEMENT ===================
 
@@ -167,11 +340,11 @@ class GameState:
 
     def can_afford_remove(self, gene_name: str) -> bool:
         """Check if player can afford to remove gene."""
-        return self.ep >= self.get_remove_cost(gene_name)
+        return self.ep >= self._REMOVE_COST
 
     def spend_for_remove(self, gene_name: str) -> bool:
         """Spend EP to remove gene."""
-        cost = self.get_remove_cost(gene_name)
+        cost = self._REMOVE_COST
         if self.ep >= cost:
             self.ep -= cost
             return True
@@ -184,37 +357,146 @@ class GameState:
 
     # =================== DECK MANAGEMENT ===================
 
+    def set_deck(self, gene_names: List[str]):
+        """Replace the deck with the given genes."""
+        self.deck = list(gene_names)
+        self._deck_set = set(self.deck)
+        self._exclusion_cache = None
+
+    def deal_initial_deck(self, size: int):
+        """Replace the deck with up to size random genes from the database."""
+        all_names = self._all_gene_names()
+        self.set_deck(self._sample_k_partial_fy(all_names, min(size, len(all_names))))
+
     def add_to_deck(self, gene_name: str) -> bool:
         """Add gene to deck."""
-        if gene_name not in self.deck:
-            self.deck.append(gene_name)
-            return True
-        return False
+        if gene_name in self._deck_set:
+            return False
+        self._deck_set.add(gene_name)
+        self.deck.append(gene_name)
+        self._exclusion_cache = None
+        return True
 
     def in_deck(self, gene_name: str) -> bool:
         """Check if gene is in deck."""
-        return gene_name in self.deck
+        return gene_name in self._deck_set
+
+    def record_installed_gene(self, gene_name: str) -> bool:
+        """Record a gene as installed in the current virus."""
+        if gene_name in self._installed_set:
+            return False
+        self._installed_set.add(gene_name)
+        self.installed_genes.append(gene_name)
+        self._exclusion_cache = None
+        return True
+
+    def record_removed_gene(self, gene_name: str) -> bool:
+        """Record a gene as removed from the current virus."""
+        if gene_name not in self._installed_set:
+            return False
+        self._installed_set.discard(gene_name)
+        self.installed_genes.remove(gene_name)
+        self._exclusion_cache = None
+        return True
+
+    def get_offer_exclusions(self) -> FrozenSet[str]:
+        """Get the genes that must not be offered (deck plus installed, cached)."""
+        if self._exclusion_cache is None:
+            self._exclusion_cache = frozenset(self._deck_set | self._installed_set)
+        return self._exclusion_cache
 
     # =================== GENE OFFERS ===================
 
-    def _all_gene_names(self) -> List[str]:
-        """Get all available gene names from database."""
+    def _all_gene_names(self) -> Tuple[str, ...]:
+        """Get all available gene names from database (cached)."""
         if not self.db_manager:
-            return []
-        return list(self.db_manager.get_all_genes())
+            return ()
+        if self._all_gene_names_cache is None:
+            self._all_gene_names_cache = self.db_manager.get_all_genes_cached()
+            self._all_gene_names_set = frozenset(self._all_gene_names_cache)
+        return self._all_gene_names_cache
+
+    def invalidate_gene_cache(self):
+        """Drop cached gene names and costs after the DB's genes change."""
+        self._all_gene_names_cache = None
+        self._all_gene_names_set = frozenset()
+        self._gene_cost_cache.clear()
 
     def draw_gene_offers(
             self, n: Optional[int] = None, exclude: Optional[Set[str]] = None
     ) -> List[str]:
-        """Draw random gene offers."""
+        """
+        Draw random gene offers.
+
+        Candidates are taken in DB insertion order (no sorting), which is
+        stable, so a given seed reproduces the same offers.
+        """
         n = n or self.offer_size
-        exclude = exclude or set()
-        pool = set(self._all_gene_names()) - set(self.deck) - set(exclude)
-        pool_list = sorted(pool)
-        if not pool_list:
+        all_names = self._all_gene_names()
+        if not exclude and not self._deck_set:
+            # Nothing to filter out: sample the cached tuple directly
+            return self._sample_k_partial_fy(all_names, min(n, len(all_names)))
+
+        blocked = self._deck_set.union(exclude) if exclude else self._deck_set
+        available = len(all_names) - len(self._all_gene_names_set.intersection(blocked))
+        k = min(n, available)
+        if k <= 0:
             return []
-        k = min(n, len(pool_list))
-        return self._rng.sample(pool_list, k)
+
+        if available * 2 < len(all_names):
+            # Mostly blocked: sample from the filtered pool in DB order
+            return self._sample_k_partial_fy([name for name in all_names if name not in blocked], k)
+
+        # Mostly free: draw indices and reject blocked/repeated names, so
+        # only O(k) is allocated instead of a sorted copy of the pool
+        offers: List[str] = []
+        picked: Set[str] = set()
+        # Scaling random() skips randrange's argument checks; the bias from
+        # 53-bit floats is negligible for gene-pool sizes
+        uniform = self._rng.random
+        total = len(all_names)
+        attempts = k * _MAX_REJECTION_ROUNDS
+        while len(offers) < k:
+            if not attempts:
+                # Unlucky streak: finish from the filtered pool
+                rest = [name for name in all_names if name not in blocked and name not in picked]
+                return offers + self._sample_k_partial_fy(rest, k - len(offers))
+            attempts -= 1
+            name = all_names[int(uniform() * total)]
+            if name not in blocked and name not in picked:
+                picked.add(name)
+                offers.append(name)
+        return offers
+
+    def _sample_k_partial_fy(self, items: Sequence[str], k: int) -> List[str]:
+        """
+        Pick k distinct items by a partial Fisher-Yates shuffle.
+
+        Swaps are recorded in a dict instead of copying items, and the swap
+        offsets are drawn in 64-bit batches, so a typical offer (k <= 6)
+        costs one getrandbits call.
+        """
+        total = len(items)
+        swapped: Dict[int, int] = {}
+        picked: List[str] = []
+        getrandbits = self._rng.getrandbits
+        i = 0
+        while i < k:
+            # Batch the bounds total-i, total-i-1, ... while they fit in 64 bits
+            bounds = []
+            product = 1
+            bound = total - i
+            while i + len(bounds) < k and product * bound <= _WORD_RANGE:
+                bounds.append(bound)
+                product *= bound
+                bound -= 1
+
+            for offset in _batched_randbelow(getrandbits, bounds, product):
+                j = i + offset
+                picked.append(items[swapped.get(j, j)])
+                swapped[j] = swapped.get(i, i)
+                i += 1
+        return picked
 
     # =================== STARTING ENTITY COUNT ===================
 
@@ -248,14 +530,18 @@ class GameState:
 
     def reset_milestone_progress(self):
         """Reset milestone progress for a new play run."""
-        self.milestones_achieved_this_run.clear()
+        self._run_mask = 0
+        self._unmapped_run = frozenset()
         self.current_turn = 0
         self.peak_entity_counts.clear()
         self.cumulative_entity_counts.clear()
+        self._reset_pending_milestones()
 
     def reset_for_new_game(self):
         """Reset all milestone data for a new game/playthrough."""
-        self.achieved_milestones.clear()
+        self._achieved_mask = 0
+        self._unmapped_achieved = frozenset()
+        self._total_ep_earned = 0
         self.reset_milestone_progress()
 
     def update_turn_count(self, turn_number: int):
@@ -272,169 +558,216 @@ class GameState:
         if not self.db_manager:
             return
 
+        class_of = self._class_of
+        tracked = None if self.track_all_entity_classes else self._tracked_classes
+
         # Group current entities by class for peak tracking
-        current_by_class = {}
+        current_by_class = Counter()
         for entity_name, count in current_entities.items():
-            entity_data = self.db_manager.get_entity(entity_name)
-            if entity_data:
-                entity_class = entity_data.get("entity_class", "unknown")
-                current_by_class[entity_class] = current_by_class.get(entity_class, 0) + count
+            entity_class = class_of(entity_name)
+            if entity_class is not None:
+                current_by_class[entity_class] += count
 
-        # Update peak counts
+        # Update peak counts (missing Counter keys read as 0)
+        peak_counts = self.peak_entity_counts
         for entity_class, count in current_by_class.items():
-            self.peak_entity_counts[entity_class] = max(
-                self.peak_entity_counts.get(entity_class, 0),
-                count
-            )
+            if tracked is not None and entity_class not in tracked:
+                continue
+            peak_counts[entity_class] = max(peak_counts[entity_class], count)
 
         # Update cumulative counts if entities were created
         if entities_created_this_turn:
+            cumulative_counts = self.cumulative_entity_counts
             for entity_name, count in entities_created_this_turn.items():
-                entity_data = self.db_manager.get_entity(entity_name)
-                if entity_data:
-                    entity_class = entity_data.get("entity_class", "unknown")
-                    self.cumulative_entity_counts[entity_class] = (
-                            self.cumulative_entity_counts.get(entity_class, 0) + count
-                    )
+                entity_class = class_of(entity_name)
+                if entity_class is None or (tracked is not None and entity_class not in tracked):
+                    continue
+                cumulative_counts[entity_class] += count
 
         self._check_entity_count_milestones()
 
+    def _class_of(self, entity_name: str) -> Optional[str]:
+        """Get an entity's class (None if unknown to the DB), memoized per DB."""
+        try:
+            return self._entity_class_cache[entity_name]
+        except KeyError:
+            entity_data = self.db_manager.get_entity(entity_name)
+            entity_class = entity_data.get("entity_class", "unknown") if entity_data else None
+            self._entity_class_cache[entity_name] = entity_class
+            return entity_class
+
     def _check_survival_milestones(self):
         """Check if any survival milestones have been achieved."""
-        for milestone_id, milestone in self._milestone_definitions.items():
-            if (milestone["type"] == "survive_turns"
-                    and milestone_id not in self.achieved_milestones
-                    and milestone_id not in self.milestones_achieved_this_run):
-                if self.current_turn >= milestone["target"]:
-                    self.milestones_achieved_this_run.add(milestone_id)
-                    self.achieved_milestones.add(milestone_id)
+        survival = self._survival_milestones
+        # Buckets are sorted, so the first target decides whether to scan
+        if survival and survival[0][1] <= self.current_turn:
+            self._check_sorted_milestones(survival, self.current_turn)
 
     def _check_entity_count_milestones(self):
         """Check if any entity count milestones have been achieved."""
-        for milestone_id, milestone in self._milestone_definitions.items():
-            if (milestone_id in self.achieved_milestones
-                    or milestone_id in self.milestones_achieved_this_run):
-                continue
+        emptied = False
+        # Class buckets are never empty here, so bucket[0] is the lowest target
+        peak_counts = self.peak_entity_counts
+        for entity_class, bucket in self._peak_milestones_by_class.items():
+            current = peak_counts.get(entity_class, 0)
+            if bucket[0][1] <= current:
+                self._check_sorted_milestones(bucket, current)
+                emptied = emptied or not bucket
+
+        cumulative_counts = self.cumulative_entity_counts
+        for entity_class, bucket in self._cumulative_milestones_by_class.items():
+            current = cumulative_counts.get(entity_class, 0)
+            if bucket[0][1] <= current:
+                self._check_sorted_milestones(bucket, current)
+                emptied = emptied or not bucket
+
+        if emptied:
+            # Classes whose milestones are all achieved stop being tracked
+            self._peak_milestones_by_class = {
+                entity_class: bucket for entity_class, bucket in self._peak_milestones_by_class.items() if bucket
+            }
+            self._cumulative_milestones_by_class = {
+                entity_class: bucket for entity_class, bucket in self._cumulative_milestones_by_class.items() if bucket
+            }
+            self._tracked_classes = (
+                self._peak_milestones_by_class.keys() | self._cumulative_milestones_by_class.keys()
+            )
 
-            milestone_type = milestone["type"]
-            target = milestone["target"]
-            entity_class = milestone.get("entity_class")
+    def _check_sorted_milestones(self, bucket: List[Tuple[str, int]], current: int):
+        """Award the pending milestones in a target-sorted bucket reached by current."""
+        # Binary search in C for the prefix with target <= current
+        reached = bisect_right(bucket, current, key=_TARGET)
+        if not reached:
+            return
 
-            if milestone_type == "peak_entity_count" and entity_class:
-                current_peak = self.peak_entity_counts.get(entity_class, 0)
-                if current_peak >= target:
-                    self.milestones_achieved_this_run.add(milestone_id)
-                    self.achieved_milestones.add(milestone_id)
+        bits = self._milestone_bits
+        definitions = self._milestone_definitions
+        pending = self._pending_milestone_ids
+        mask = 0
+        earned = 0
+        for milestone_id, _ in bucket[:reached]:
+            mask |= bits[milestone_id]
+            milestone = definitions.get(milestone_id)
+            if milestone:
+                earned += milestone["reward_ep"]
+            pending.discard(milestone_id)
 
-            elif milestone_type == "cumulative_entity_count" and entity_class:
-                current_cumulative = self.cumulative_entity_counts.get(entity_class, 0)
-                if current_cumulative >= target:
-                    self.milestones_achieved_this_run.add(milestone_id)
-                    self.achieved_milestones.add(milestone_id)
+        self._run_mask |= mask
+        self._achieved_mask |= mask
+        self._total_ep_earned += earned
+        # Achieved milestones leave the bucket so they are never re-checked
+        del bucket[:reached]
 
     def get_milestone_progress(self) -> Dict:
         """Get comprehensive milestone progress data for UI display."""
         achieved = []
         open_milestones = []
         newly_achieved_this_run = []
-        total_ep_earned = 0
+        bits = self._milestone_bits
+        achieved_mask = self._achieved_mask
+        run_mask = self._run_mask
 
         for milestone_id, milestone in self._milestone_definitions.items():
-            milestone_data = milestone.copy()
-            milestone_data["achieved"] = milestone_id in self.achieved_milestones
-            milestone_data["achieved_this_run"] = milestone_id in self.milestones_achieved_this_run
+            # Definitions added since the last refresh have no bit yet
+            bit = bits.get(milestone_id)
+            if bit is None:
+                achieved_this_run = milestone_id in self._unmapped_run
+                is_achieved = milestone_id in self._unmapped_achieved
+            else:
+                achieved_this_run = bool(run_mask & bit)
+                is_achieved = bool(achieved_mask & bit)
 
-            if milestone_data["achieved"]:
+            if is_achieved:
+                # Achieved milestones need no progress info
+                milestone_data = {**milestone, "achieved": True, "achieved_this_run": achieved_this_run}
                 achieved.append(milestone_data)
-                total_ep_earned += milestone["reward_ep"]
 
-                if milestone_data["achieved_this_run"]:
+                if achieved_this_run:
                     newly_achieved_this_run.append(milestone_data)
             else:
-                progress_info = self._get_milestone_progress_info(milestone)
-                milestone_data.update(progress_info)
-                open_milestones.append(milestone_data)
+                current, target, description = self._get_milestone_progress_info(milestone_id, milestone)
+                open_milestones.append({
+                    **milestone,
+                    "achieved": False,
+                    "achieved_this_run": achieved_this_run,
+                    "current_progress": current,
+                    "target_progress": target,
+                    "progress_description": description
+                })
 
         return {
             "achieved": achieved,
             "open": open_milestones,
-            "total_ep_earned": total_ep_earned,
+            "total_ep_earned": self._total_ep_earned,
             "newly_achieved_this_run": newly_achieved_this_run
         }
 
-    def _get_milestone_progress_info(self, milestone: Dict) -> Dict:
-        """Get progress information for a specific milestone."""
+    def _get_milestone_progress_info(self, milestone_id: str, milestone: Dict) -> Tuple[int, int, str]:
+        """Get (current, target, description) progress for a specific milestone."""
         milestone_type = milestone["type"]
         target = milestone["target"]
 
         if milestone_type == "survive_turns":
             current = self.current_turn
-            return {
-                "current_progress": current,
-                "target_progress": target,
-                "progress_description": f"{current}/{target} turns"
-            }
-
         elif milestone_type == "peak_entity_count":
-            entity_class = milestone.get("entity_class", "unknown")
-            current = self.peak_entity_counts.get(entity_class, 0)
-            return {
-                "current_progress": current,
-                "target_progress": target,
-                "progress_description": f"{current}/{target} {entity_class} entities (peak)"
-            }
-
+            current = self.peak_entity_counts.get(milestone.get("entity_class", "unknown"), 0)
         elif milestone_type == "cumulative_entity_count":
-            entity_class = milestone.get("entity_class", "unknown")
-            current = self.cumulative_entity_counts.get(entity_class, 0)
-            return {
-                "current_progress": current,
-                "target_progress": target,
-                "progress_description": f"{current}/{target} {entity_class} entities (total)"
-            }
+            current = self.cumulative_entity_counts.get(milestone.get("entity_class", "unknown"), 0)
+        else:
+            return 0, target, "Unknown milestone type"
 
-        return {
-            "current_progress": 0,
-            "target_progress": target,
-            "progress_description": "Unknown milestone type"
-        }
+        # Reuse the last description while this milestone's progress is unchanged
+        cached = self._progress_descriptions.get(milestone_id)
+        if cached is not None and cached[0] == current:
+            return current, target, cached[1]
+
+        if milestone_type == "survive_turns":
+            description = f"{current}/{target} turns"
+        elif milestone_type == "peak_entity_count":
+            description = f"{current}/{target} {milestone.get('entity_class', 'unknown')} entities (peak)"
+        else:
+            description = f"{current}/{target} {milestone.get('entity_class', 'unknown')} entities (total)"
+        self._progress_descriptions[milestone_id] = (current, description)
+        return current, target, description
 
     def award_milestone_achievements(self) -> List[Dict]:
         """Award EP for milestones achieved in this run and return list."""
         newly_achieved = []
 
-        for milestone_id in self.milestones_achieved_this_run:
-            milestone = self._milestone_definitions.get(milestone_id)
-            if milestone:
-                reward_ep = milestone["reward_ep"]
-                self.award_ep(reward_ep)
-
-                milestone_copy = milestone.copy()
-                milestone_copy["achieved"] = True
-                newly_achieved.append(milestone_copy)
+        for milestone in self._milestones_from_mask(self._run_mask):
+            self.award_ep(milestone["reward_ep"])
+            newly_achieved.append({**milestone, "achieved": True})
 
         return newly_achieved
 
-    def get_available_milestones(self) -> List[Dict]:
-        """Get all milestone definitions from database."""
-        return list(self._milestone_definitions.values())
+    def get_available_milestones(self) -> Tuple[Dict, ...]:
+        """Get all milestone definitions from database (shared; treat as read-only)."""
+        return self._milestone_defs_tuple
 
     def refresh_milestone_definitions(self):
         """Refresh milestone definitions from database."""
+        self._entity_class_cache.clear()
+        self._starter_entities_cache = None
         self._load_milestone_definitions()
 
     def has_milestones_achieved_this_run(self) -> bool:
         """Check if any milestones were achieved in the current run."""
-        return len(self.milestones_achieved_this_run) > 0
+        return self._run_mask != 0 or bool(self._unmapped_run)
 
     def get_milestones_achieved_this_run(self) -> List[Dict]:
         """Get list of milestones achieved in this specific run."""
-        achieved_this_run = []
-        for milestone_id in self.milestones_achieved_this_run:
-            milestone = self._milestone_definitions.get(milestone_id)
-            if milestone:
-                milestone_copy = milestone.copy()
-                milestone_copy["achieved"] = True
-                milestone_copy["achieved_this_run"] = True
-                achieved_this_run.append(milestone_copy)
-        return achieved_this_run
\ No newline at end of file
+        return [
+            {**milestone, "achieved": True, "achieved_this_run": True}
+            for milestone in self._milestones_from_mask(self._run_mask)
+        ]
+
+    def _milestones_from_mask(self, mask: int) -> List[Dict]:
+        """Get the definitions whose bits are set in mask, in definition order."""
+        definitions = self._milestone_definitions
+        milestones = []
+        for milestone_id, bit in self._milestone_bits.items():
+            if mask & bit:
+                milestone = definitions.get(milestone_id)
+                if milestone:
+                    milestones.append(milestone)
+        return milestones
\ No newline at end of file
@@ -6,8 +6,7 @@ Coordinates all game modules and manages application flow.
 
 import tkinter as tk
 from tkinter import messagebox
-import random
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from tkinter import ttk
 
 from constants import (
@@ -23,6 +22,12 @@ from constants import (
 from data_models import GeneDatabaseManager
 from game_state import GameState
 from ui_base import CustomStyles, UIUtilities
+from ui_menu_builder import MenuModule, BuilderModule
+from ui_play import PlayModule
+from ui_editor import EditorModule
+
+# Offer dialog row: gene name and cost
+_GENE_OFFER_FMT = "%s (%s EP)"
 
 
 class VirusSandboxController:
@@ -33,37 +38,52 @@ class VirusSandboxController:
         self.root.title("Virus Sandbox")
         self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.root.minsize(WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT)
+        # Stay withdrawn until run() so the first map shows a laid-out menu
+        self.root.withdraw()
 
         # Setup custom styles
         CustomStyles.setup_styles()
 
-        # Initialize modules (will be populated in setup_modules)
+        # Modules are built on first use from these factories (see setup_modules)
         self.modules: Dict[str, any] = {}
+        self._module_factories: Dict[str, Callable[[], any]] = {}
         self.current_module: Optional[str] = None
         self.current_database_manager: Optional[GeneDatabaseManager] = None
 
         # Persistent game state
         self.game_state: Optional[GameState] = None
 
+        # Set while a coalesced builder refresh is queued for the next idle pass
+        self._pending_builder_refresh = False
+
         self.setup_modules()
         self.switch_to_module("menu")
+        self.root.update_idletasks()
 
     def setup_modules(self):
-        """Initialize all game modules."""
-        # Import UI modules here to avoid circular imports
-        # These will be available after Phase 3 is delivered
-        try:
-            from ui_menu_builder import MenuModule, BuilderModule
-            from ui_play import PlayModule
-            from ui_editor import EditorModule
-
-            self.modules["menu"] = MenuModule(self.root, self)
-            self.modules["builder"] = BuilderModule(self.root, self)
-            self.modules["play"] = PlayModule(self.root, self)
-            self.modules["editor"] = EditorModule(self.root, self)
-        except ImportError:
-            # Fallback for when Phase 3 modules aren't ready yet
-            print("Warning: UI modules not yet available. Phase 3 needed.")
+        """Register the game module factories; each widget tree is built on first use."""
+        self._module_factories = {
+            "menu": lambda: MenuModule(self.root, self),
+            "builder": lambda: BuilderModule(self.root, self),
+            "play": lambda: PlayModule(self.root, self),
+            "editor": lambda: EditorModule(self.root, self),
+        }
+
+    def get_module(self, module_name: str):
+        """Return a module, constructing it the first time it is needed."""
+        module = self.modules.get(module_name)
+        if module is not None:
+            return module
+
+        factory = self._module_factories.get(module_name)
+        if factory is None:
+            raise ValueError(f"Unknown module: {module_name}")
+
+        module = self.modules[module_name] = factory()
+        # A late-built editor still follows the database of the running game
+        if module_name == "editor" and self.current_database_manager:
+            module.set_database_manager(self.current_database_manager)
+        return module
 
     def switch_to_module(self, module_name: str):
         """Switch to a different module and handle post-Play gene offer timing."""
@@ -71,11 +91,10 @@ class VirusSandboxController:
         if self.current_module:
             self.modules[self.current_module].hide()
 
-        if module_name not in self.modules:
-            raise ValueError(f"Unknown module: {module_name}")
+        module = self.get_module(module_name)
 
         self.current_module = module_name
-        self.modules[module_name].show()
+        module.show()
 
         # When returning FROM Play TO Builder, show pending gene offer
         if prev == "play" and module_name == "builder" and self.game_state:
@@ -100,23 +119,22 @@ class VirusSandboxController:
         self.game_state.reset_starting_entity_count()
 
         # Seed deck with random genes
-        all_genes = database_manager.get_all_genes()
-        initial_deck_size = min(INITIAL_DECK_SIZE, len(all_genes))
-        self.game_state.deck = random.sample(all_genes, initial_deck_size)
+        self.game_state.deal_initial_deck(INITIAL_DECK_SIZE)
 
         # Wire modules
-        self.modules["builder"].set_database_manager(database_manager)
-        self.modules["builder"].set_game_state(self.game_state)
+        builder = self.get_module("builder")
+        builder.set_database_manager(database_manager)
+        builder.set_game_state(self.game_state)
 
-        self.modules["play"].set_database_manager(database_manager)
-        self.modules["play"].set_game_state(self.game_state)
+        play = self.get_module("play")
+        play.set_database_manager(database_manager)
+        play.set_game_state(self.game_state)
 
-        # Wire editor with database manager
-        self.modules["editor"].db_manager = database_manager
-        self.modules["editor"].update_database_display()
-        self.modules["editor"].update_entity_list()
-        self.modules["editor"].update_gene_list()
-        self.modules["editor"].update_milestone_list()
+        # Wire editor with database manager (it refreshes when next shown);
+        # an editor that has not been built yet picks it up in get_module
+        editor = self.modules.get("editor")
+        if editor:
+            editor.set_database_manager(database_manager)
 
         self.switch_to_module("builder")
 
@@ -131,8 +149,8 @@ class VirusSandboxController:
             self.game_state.cycles_used += 1
             self.game_state.offer_pending = False
 
-        self.modules["play"].set_virus_blueprint(virus_blueprint)
-        self.modules["play"].set_game_state(self.game_state)
+        # The play module already holds this game state from start_new_game_with_database
+        self.get_module("play").set_virus_blueprint(virus_blueprint)
         self.switch_to_module("play")
 
     def skip_round(self):
@@ -161,35 +179,33 @@ class VirusSandboxController:
             messagebox.showerror("Gene Offer Error", f"Error showing gene offer: {e}")
 
         # Update builder UI
-        builder = self.modules.get("builder")
-        if builder:
-            try:
-                builder.update_virus_display()
-            except Exception:
-                pass
+        self._request_builder_refresh()
 
     def _show_gene_offer_dialog(self):
         """Offer one of up to 5 random genes to add to the deck."""
         if not (self.current_database_manager and self.game_state):
             return
 
-        # Build exclusion set
-        exclude = set(self.game_state.deck) | set(self.game_state.installed_genes)
+        # No offer slots: nothing to choose, so take the skip bonus without
+        # building exclusions or a dialog
+        if self.game_state.offer_size <= 0:
+            self.game_state.increase_starting_entity_count()
+            self._show_starting_bonus()
+            self._request_builder_refresh()
+            return
 
-        all_genes = list(self.current_database_manager.get_all_genes())
-        pool = [g for g in all_genes if g not in exclude]
-        if not pool:
+        # Deck and installed genes are never offered
+        offers = self.game_state.draw_gene_offers(exclude=self.game_state.get_offer_exclusions())
+        if not offers:
             messagebox.showinfo("Gene Offer", "No new genes are available.")
             return
 
-        k = min(self.game_state.offer_size, len(pool))
-        offers = random.sample(pool, k)
-
-        # Create modal dialog
+        # Create modal dialog; keep it withdrawn while widgets are built so
+        # Tk lays it out once instead of after every pack
         dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.title("Evolutionary Opportunity")
         dialog.transient(self.root)
-        dialog.grab_set()
 
         UIUtilities.center_dialog(dialog, GENE_OFFER_DIALOG_WIDTH, GENE_OFFER_DIALOG_HEIGHT)
 
@@ -209,12 +225,10 @@ class VirusSandboxController:
         selection_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 10))
 
         listbox = tk.Listbox(selection_frame, height=min(10, len(offers)), font=("Arial", 10))
-        for name in offers:
-            cost = 0
-            gene = self.current_database_manager.get_gene(name)
-            if gene:
-                cost = gene.get("cost", 0)
-            listbox.insert(tk.END, f"{name} ({cost} EP)")
+        # One batched gene lookup and one Tcl insert for all rows
+        offered_genes = self.current_database_manager.get_genes(offers)
+        costs = {name: gene.get("cost", 0) for name, gene in offered_genes.items()}
+        listbox.insert(tk.END, *[_GENE_OFFER_FMT % (name, costs.get(name, 0)) for name in offers])
         listbox.pack(fill=tk.BOTH, expand=True)
 
         # Starting count bonus info
@@ -231,7 +245,13 @@ class VirusSandboxController:
                 foreground="blue"
             ).pack()
 
-        selection_holder = {"choice": None}
+        selection_holder = {"choice": None, "skipped": False}
+        # Set on every close path; waiting on it keeps idle callbacks running
+        done = tk.BooleanVar(self.root, value=False)
+
+        def close_dialog():
+            done.set(True)
+            dialog.destroy()
 
         def choose_and_close():
             sel = listbox.curselection()
@@ -239,12 +259,13 @@ class VirusSandboxController:
                 display = listbox.get(sel[0])
                 gene_name = display.split(" (")[0]
                 selection_holder["choice"] = gene_name
-            dialog.destroy()
+            close_dialog()
 
         def skip_and_get_bonus():
             """Skip gene selection and get starting entity bonus."""
             self.game_state.increase_starting_entity_count(2)
-            dialog.destroy()
+            selection_holder["skipped"] = True
+            close_dialog()
 
         # Button area
         button_frame = ttk.Frame(dialog)
@@ -257,13 +278,19 @@ class VirusSandboxController:
         skip_text = "Skip (+2 starting entities)"
         ttk.Button(button_frame, text=skip_text, command=skip_and_get_bonus).pack(side=tk.LEFT)
 
+        # Single layout pass, then show; the grab needs a viewable window
+        dialog.update_idletasks()
+        dialog.deiconify()
+        dialog.grab_set()
+
         # Focus and keyboard handling
         dialog.focus_set()
-        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        dialog.bind('<Escape>', lambda e: close_dialog())
         dialog.bind('<Return>', lambda e: choose_and_close())
+        dialog.protocol("WM_DELETE_WINDOW", close_dialog)
 
         # Wait for dialog to close
-        self.root.wait_window(dialog)
+        self.root.wait_variable(done)
 
         picked = selection_holder["choice"]
         if picked:
@@ -271,17 +298,32 @@ class VirusSandboxController:
                 messagebox.showinfo("Gene Added", f"Added to deck: {picked}")
             else:
                 messagebox.showinfo("No Change", f"{picked} was already in your deck.")
-        else:
+        elif selection_holder["skipped"]:
             # Show bonus confirmation if they skipped
-            new_count = self.game_state.get_starting_entity_count()
-            if new_count > current_count:
-                messagebox.showinfo(
-                    "Starting Bonus",
-                    f"You now start with {new_count} entities instead of 10!\n"
-                    f"(Bonus: +{new_count - 10} entities)"
-                )
+            self._show_starting_bonus()
 
         # Refresh Builder UI
+        self._request_builder_refresh()
+
+    def _show_starting_bonus(self):
+        """Confirm the starting entity bonus earned by skipping a gene offer."""
+        new_count = self.game_state.get_starting_entity_count()
+        messagebox.showinfo(
+            "Starting Bonus",
+            f"You now start with {new_count} entities instead of 10!\n"
+            f"(Bonus: +{new_count - 10} entities)"
+        )
+
+    def _request_builder_refresh(self):
+        """Queue one builder refresh for when the current operation has finished."""
+        if self._pending_builder_refresh:
+            return
+        self._pending_builder_refresh = True
+        self.root.after_idle(self._flush_builder_refresh)
+
+    def _flush_builder_refresh(self):
+        """Run the queued builder refresh, however many callers requested it."""
+        self._pending_builder_refresh = False
         builder = self.modules.get("builder")
         if builder:
             try:
@@ -291,8 +333,9 @@ class VirusSandboxController:
                 pass
 
     def handle_database_change(self):
-        """Handle database changes that might affect milestones."""
+        """Handle database changes that might affect milestones or the gene pool."""
         if self.game_state:
+            self.game_state.invalidate_gene_cache()
             self.game_state.refresh_milestone_definitions()
 
     def validate_current_milestones(self) -> tuple[bool, str]:
@@ -302,10 +345,10 @@ class VirusSandboxController:
 
         try:
             milestones = self.current_database_manager.get_milestones()
+            results = self.current_database_manager.validate_milestones_batch(list(milestones.values()))
             invalid_milestones = []
 
-            for milestone_id, milestone_data in milestones.items():
-                is_valid, error_msg = self.current_database_manager.validate_milestone_data(milestone_data)
+            for milestone_id, (is_valid, error_msg) in zip(milestones, results):
                 if not is_valid:
                     invalid_milestones.append(f"{milestone_id}: {error_msg}")
 
@@ -328,15 +371,16 @@ class VirusSandboxController:
     def quit_application(self):
         """Exit the application."""
         # Check for unsaved changes in editor
-        if (hasattr(self.modules.get("editor", {}), 'db_manager') and
-                self.modules["editor"].db_manager.is_modified):
+        editor = self.modules.get("editor")
+        db_manager = getattr(editor, "db_manager", None) if editor is not None else None
+        if db_manager is not None and db_manager.is_modified:
             result = messagebox.askyesnocancel(
                 "Unsaved Changes",
                 "You have unsaved changes in the gene editor. Save before exiting?"
             )
             if result is True:
                 try:
-                    self.modules["editor"].save_database()
+                    editor.save_database()
                 except:
                     pass
             elif result is None:
@@ -348,6 +392,7 @@ class VirusSandboxController:
     def run(self):
         """Start the application."""
         self.root.protocol("WM_DELETE_WINDOW", self.quit_application)
+        self.root.deiconify()
         self.root.mainloop()
 
 
@@ -4,8 +4,11 @@ Virus Simulation Logic
 Handles virus building and simulation execution.
 """
 
+import copy
 import random
-from typing import Dict, List, Optional, Any
+from collections import Counter, deque
+from math import floor, lgamma, log, log1p, sqrt
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
 
 from constants import (
     DEFAULT_STARTING_ENTITY_COUNT,
@@ -13,16 +16,234 @@ from constants import (
     INTERFERON_MAX,
     INTERFERON_DECAY_PER_TURN,
     INTERFERON_PRECISION,
-    INTERFERON_RNA_DEGRADATION_BONUS,
-    INTERFERON_PROTEIN_DEGRADATION_BONUS,
-    INTERFERON_DNA_DEGRADATION_BONUS,
-    ENTITY_CLASS_RNA,
-    ENTITY_CLASS_PROTEIN,
-    ENTITY_CLASS_DNA,
+    INTERFERON_DEGRADATION_BONUS_BY_CLASS,
     LOCATION_DISPLAY_ORDER,
     LOCATION_DISPLAY_LABELS,
+    CONSOLE_SEPARATOR_FULL,
+    CONSOLE_SEPARATOR_HALF,
+    CONSOLE_LOG_MAX_LINES,
 )
 
+# Entity classes are matched case-insensitively against the bonus table
+_INTERFERON_BONUS_BY_LOWER_CLASS = {
+    entity_class.lower(): bonus
+    for entity_class, bonus in INTERFERON_DEGRADATION_BONUS_BY_CLASS.items()
+}
+
+
+def _binomial(uniform: Callable[[], float], n: int, p: float) -> int:
+    """
+    Count the successes in n independent trials of probability p.
+
+    Small means jump from success to success with geometric gaps
+    (O(n * p) draws); larger ones use Hoermann's BTRS transformed
+    rejection, which needs about two draws whatever n is.
+    """
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if p > 0.5:
+        return n - _binomial(uniform, n, 1.0 - p)
+
+    if n * p < 10.0:
+        log_q = log1p(-p)
+        successes = 0
+        trials = 0
+        while True:
+            # 1 - uniform() lies in (0, 1], so the log is finite
+            gap = log(1.0 - uniform()) / log_q
+            if gap >= n - trials:
+                return successes
+            trials += int(gap) + 1
+            successes += 1
+
+    spq = sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    v_r = 0.92 - 4.2 / b
+    alpha = lpq = mode = h = None
+    while True:
+        u = uniform() - 0.5
+        us = 0.5 - abs(u)
+        if us <= 0.0:
+            continue
+        k = floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+
+        v = uniform()
+        # Squeeze: accept most draws without evaluating the density
+        if us >= 0.07 and v <= v_r:
+            return k
+
+        if alpha is None:
+            alpha = (2.83 + 5.1 / b) * spq
+            lpq = log(p / (1.0 - p))
+            mode = floor((n + 1) * p)
+            h = lgamma(mode + 1) + lgamma(n - mode + 1)
+        v *= alpha / (a / (us * us) + b)
+        if v > 0.0 and log(v) <= h - lgamma(k + 1) - lgamma(n - k + 1) + (k - mode) * lpq:
+            return k
+
+
+# Only these rule types ever fire; any other type is baked with probability 0
+_FIRING_RULE_TYPES = frozenset(("per_entity", "per_pair"))
+
+
+class _BakedRule(NamedTuple):
+    """A transition rule flattened into (entity, count) pairs for the turn loop."""
+    name: str
+    inputs: Tuple[Tuple[str, int], ...]  # every input, consumed or not
+    consumed: Tuple[Tuple[str, int], ...]
+    outputs: Tuple[Tuple[str, int], ...]
+    probability: float
+    interferon_amount: float
+    rule: Dict
+
+
+def _bake_rule(rule: Dict) -> _BakedRule:
+    """Flatten a blueprint rule dict into a _BakedRule."""
+    inputs = rule["inputs"]
+    return _BakedRule(
+        name=rule["name"],
+        inputs=tuple((spec["entity"], spec["count"]) for spec in inputs),
+        consumed=tuple((spec["entity"], spec["count"]) for spec in inputs if spec["consumed"]),
+        outputs=tuple((spec["entity"], spec["count"]) for spec in rule["outputs"]),
+        probability=rule["probability"] if rule["rule_type"] in _FIRING_RULE_TYPES else 0.0,
+        interferon_amount=float(rule.get("interferon_amount", 0.0) or 0.0),
+        rule=rule,
+    )
+
+
+def _max_applications(inputs: Tuple[Tuple[str, int], ...], entity_state: Dict[str, int]) -> int:
+    """How many times all inputs can be covered from entity_state (0 for no inputs)."""
+    max_apps = 0
+    for entity_name, count in inputs:
+        apps = entity_state.get(entity_name, 0) // count
+        if apps <= 0:
+            return 0
+        if max_apps == 0 or apps < max_apps:
+            max_apps = apps
+    return max_apps
+
+
+# (rule, applications) for each rule that fired in a turn
+_FiredRules = List[Tuple[_BakedRule, int]]
+
+
+def _fire_rules(
+        baked_rules: Sequence[_BakedRule], working_entities: Dict[str, int], uniform: Callable[[], float]
+) -> _FiredRules:
+    """
+    Fire every rule once against working_entities, in order.
+
+    Each rule's firings are drawn as one binomial count and its consumed
+    inputs are deducted from the working state straight away, so later
+    rules see what earlier ones used up. Returns (rule, applications) for
+    the rules that fired. This is the hot core of a turn: it touches only
+    tuples, ints and the state dict.
+    """
+    fired = []
+    for baked in baked_rules:
+        max_applications = _max_applications(baked.inputs, working_entities)
+        if max_applications == 0:
+            continue
+        applications = _binomial(uniform, max_applications, baked.probability)
+        if applications == 0:
+            continue
+
+        for entity_name, count in baked.consumed:
+            remaining = working_entities.get(entity_name, 0) - applications * count
+            if remaining > 0:
+                working_entities[entity_name] = remaining
+            else:
+                working_entities.pop(entity_name, None)
+        fired.append((baked, applications))
+    return fired
+
+
+# Blueprints up to this many rules get a straight-line rule step; larger ones
+# keep the generic loop over the rules indexed by input entity
+_MAX_COMPILED_RULES = 64
+
+
+def _compile_fire_rules(
+        baked_rules: Sequence[_BakedRule]
+) -> Callable[[Dict[str, int], Callable[[], float]], _FiredRules]:
+    """
+    Generate a _fire_rules specialised to one blueprint.
+
+    The rule loop is unrolled into straight-line code, one block per rule.
+    Each block has that rule's inputs, counts and probability bound as
+    constants. Rules that can never fire (no inputs, zero probability) emit
+    no code at all. Every constant, entity names included, is passed through
+    the function's namespace rather than pasted into the source.
+    """
+    namespace = {"binomial": _binomial}
+    lines = [
+        "def fire_rules(working_entities, uniform):",
+        "    fired = []",
+        "    get = working_entities.get",
+        "    pop = working_entities.pop",
+    ]
+    for index, baked in enumerate(baked_rules):
+        if not baked.inputs or baked.probability <= 0.0:
+            continue
+        namespace[f"rule_{index}"] = baked
+        namespace[f"p_{index}"] = baked.probability
+
+        # Bound by each input in turn; stop at the first one that is missing
+        indent = "    "
+        for position, (entity_name, count) in enumerate(baked.inputs):
+            namespace[f"in_{index}_{position}"] = entity_name
+            namespace[f"need_{index}_{position}"] = count
+            apps = f"get(in_{index}_{position}, 0) // need_{index}_{position}"
+            if position == 0:
+                lines.append(f"{indent}max_applications = {apps}")
+            else:
+                lines.append(f"{indent}apps = {apps}")
+                lines.append(f"{indent}if apps < max_applications:")
+                lines.append(f"{indent}    max_applications = apps")
+            lines.append(f"{indent}if max_applications > 0:")
+            indent += "    "
+
+        if baked.probability >= 1.0:
+            lines.append(f"{indent}applications = max_applications")
+        else:
+            lines.append(f"{indent}applications = binomial(uniform, max_applications, p_{index})")
+        lines.append(f"{indent}if applications:")
+        indent += "    "
+        for position, (entity_name, count) in enumerate(baked.consumed):
+            namespace[f"out_{index}_{position}"] = entity_name
+            namespace[f"use_{index}_{position}"] = count
+            lines.append(f"{indent}remaining = get(out_{index}_{position}, 0) - applications * use_{index}_{position}")
+            lines.append(f"{indent}if remaining > 0:")
+            lines.append(f"{indent}    working_entities[out_{index}_{position}] = remaining")
+            lines.append(f"{indent}else:")
+            lines.append(f"{indent}    pop(out_{index}_{position}, None)")
+        lines.append(f"{indent}fired.append((rule_{index}, applications))")
+    lines.append("    return fired")
+
+    exec(compile("\n".join(lines), "<compiled rules>", "exec"), namespace)
+    return namespace["fire_rules"]
+
+
+def _abbreviate_entity_name(entity_name: str) -> str:
+    """Shorten the location suffix of long entity names for the console log."""
+    if len(entity_name) > 45:
+        if "(extracellular)" in entity_name:
+            return entity_name.replace("(extracellular)", "(ext)")
+        elif "(cytoplasm)" in entity_name:
+            return entity_name.replace("(cytoplasm)", "(cyto)")
+        elif "(endosome)" in entity_name:
+            return entity_name.replace("(endosome)", "(endo)")
+        elif "(nucleus)" in entity_name:
+            return entity_name.replace("(nucleus)", "(nuc)")
+
+    return entity_name
+
 
 class VirusBuilder:
     """Builds virus configurations from selected genes."""
@@ -31,6 +252,11 @@ class VirusBuilder:
         self.gene_db = gene_database
         self.game_state = game_state
         self.selected_genes: List[Dict] = []
+        self._selected_names: Set[str] = set()
+        # At most one polymerase gene can be selected
+        self._polymerase_name: Optional[str] = None
+        # Reverse prerequisites: gene name -> selected genes that require it
+        self._dependents: Dict[str, List[str]] = {}
 
     def set_game_state(self, game_state):
         """Set game state reference."""
@@ -51,12 +277,10 @@ class VirusBuilder:
         if not gene:
             return False, "unknown_gene"
 
-        if any(g["name"] == gene_name for g in self.selected_genes):
+        if gene_name in self._selected_names:
             return False, "already_installed"
 
-        requires = gene.get("requires", [])
-        selected_names = [g["name"] for g in self.selected_genes]
-        if not all(req in selected_names for req in requires):
+        if not self._selected_names.issuperset(gene.get("requires", [])):
             return False, "missing_prerequisites"
 
         if gene.get("is_polymerase", False) and self._has_polymerase_gene():
@@ -70,12 +294,11 @@ class VirusBuilder:
         if not gene:
             return False
 
-        if any(g["name"] == gene_name for g in self.selected_genes):
+        if gene_name in self._selected_names:
             return False
 
         requires = gene.get("requires", [])
-        selected_names = [g["name"] for g in self.selected_genes]
-        if not all(req in selected_names for req in requires):
+        if not self._selected_names.issuperset(requires):
             return False
 
         if gene.get("is_polymerase", False):
@@ -83,38 +306,52 @@ class VirusBuilder:
                 return False
 
         self.selected_genes.append(gene)
+        self._selected_names.add(gene["name"])
+        if gene.get("is_polymerase", False):
+            self._polymerase_name = gene["name"]
+        for req in requires:
+            self._dependents.setdefault(req, []).append(gene["name"])
         return True
 
     def remove_gene(self, gene_name: str):
         """Remove a gene from the virus (and dependent genes)."""
-        to_remove = []
-
-        for gene in self.selected_genes:
-            if gene_name in gene.get("requires", []):
-                to_remove.append(gene["name"])
-
-        for dep_gene in to_remove:
-            self.remove_gene(dep_gene)
-
-        for i, gene in enumerate(self.selected_genes):
-            if gene["name"] == gene_name:
-                del self.selected_genes[i]
-                break
+        to_remove = set()
+        stack = [gene_name]
+        while stack:
+            name = stack.pop()
+            if name in to_remove:
+                continue
+            to_remove.add(name)
+            stack.extend(self._dependents.get(name, ()))
+
+        removed = [gene for gene in self.selected_genes if gene["name"] in to_remove]
+        if not removed:
+            return
+        self.selected_genes[:] = [gene for gene in self.selected_genes if gene["name"] not in to_remove]
+        self._selected_names.difference_update(to_remove)
+        if self._polymerase_name in to_remove:
+            self._polymerase_name = None
+
+        for gene in removed:
+            for req in gene.get("requires", []):
+                dependents = self._dependents.get(req)
+                if dependents is None:
+                    continue
+                dependents.remove(gene["name"])
+                if not dependents:
+                    del self._dependents[req]
 
     def _has_polymerase_gene(self) -> bool:
         """Check if there's already a polymerase gene selected."""
-        return any(gene.get("is_polymerase", False) for gene in self.selected_genes)
+        return self._polymerase_name is not None
 
     def get_selected_polymerase_gene(self) -> Optional[str]:
         """Get the name of the currently selected polymerase gene."""
-        for gene in self.selected_genes:
-            if gene.get("is_polymerase", False):
-                return gene["name"]
-        return None
+        return self._polymerase_name
 
     def count_polymerase_genes(self) -> int:
         """Count the number of polymerase genes currently selected."""
-        return sum(1 for gene in self.selected_genes if gene.get("is_polymerase", False))
+        return 0 if self._polymerase_name is None else 1
 
     def get_virus_capabilities(self) -> Dict:
         """Get the full virus configuration."""
@@ -189,67 +426,170 @@ class VirusBuilder:
 class ViralSimulation:
     """Handles the actual virus simulation."""
 
-    def __init__(self, virus_blueprint: Dict):
+    def __init__(self, virus_blueprint: Dict, *, seed: Optional[int] = None):
+        self._rng = random.Random(seed)
         self.entities = virus_blueprint["starting_entities"].copy()
         self.transition_rules = virus_blueprint["transition_rules"]
+        # The blueprint is fixed for the whole run, so parse the rule dicts once
+        self._baked_rules = tuple(_bake_rule(rule) for rule in self.transition_rules)
+        # First rule for each name, for the turn log
+        self._rules_by_name: Dict[str, Dict] = {}
+        for rule in self.transition_rules:
+            self._rules_by_name.setdefault(rule.get("name"), rule)
+        # Input entity -> indexes of the rules that need it; a rule without
+        # inputs can never fire, so it is not indexed at all
+        self._rules_by_input: Dict[str, List[int]] = {}
+        for index, baked in enumerate(self._baked_rules):
+            for entity_name in dict.fromkeys(entity_name for entity_name, _ in baked.inputs):
+                self._rules_by_input.setdefault(entity_name, []).append(index)
+        # Straight-line rule step for typical blueprints (None means use the index)
+        self._compiled_fire_rules = (
+            _compile_fire_rules(self._baked_rules) if len(self._baked_rules) <= _MAX_COMPILED_RULES else None
+        )
         self.degradation_rates = virus_blueprint.get("entity_degradation_rates", {})
+        # Per-entity (interferon multiplier, location), filled from db_manager on first use
+        self._entity_profiles: Dict[str, Tuple[float, str]] = {}
+        # Per-entity (base degradation rate, interferon multiplier), built from the above
+        self._degradation_coefficients: Dict[str, Tuple[float, float]] = {}
         self.db_manager = None
         self.turn_count = 0
-        self.console_log: List[str] = []
+        # Only the most recent lines are kept; process_turn returns each turn's full log
+        self.console_log: Deque[str] = deque(maxlen=CONSOLE_LOG_MAX_LINES)
+        # Batch runs that only need the final state can switch the turn log off
+        self.logging_enabled = True
+        self._display_names: Dict[str, str] = {}
+        # Every entity this blueprint can hold, in population display order
+        self._display_order = self._sorted_display_names(
+            list(self.entities) + [entity_name for baked in self._baked_rules for entity_name, _ in baked.outputs]
+        )
 
         self.interferon_level = INTERFERON_MIN
 
+    @property
+    def db_manager(self):
+        """Database used for entity classes and locations."""
+        return self._db_manager
+
+    @db_manager.setter
+    def db_manager(self, db_manager):
+        self._db_manager = db_manager
+        self._entity_profiles.clear()
+        self._degradation_coefficients.clear()
+
+    def _replicate(self, seed: Optional[int] = None) -> "ViralSimulation":
+        """
+        Start an independent run of the same blueprint from the current state.
+
+        The replica shares everything derived from the blueprint and the
+        database (baked and compiled rules, entity caches, display order)
+        and gets its own RNG, entities, interferon level and console log.
+        """
+        replica = copy.copy(self)
+        replica._rng = random.Random(seed)
+        replica.entities = self.entities.copy()
+        replica.console_log = deque(maxlen=CONSOLE_LOG_MAX_LINES)
+        return replica
+
+    def _entity_profile(self, entity_name: str) -> Tuple[float, str]:
+        """Get an entity's interferon degradation multiplier and location (cached)."""
+        profile = self._entity_profiles.get(entity_name)
+        if profile is None:
+            entity_data = self._db_manager.get_entity(entity_name) if self._db_manager else None
+            if entity_data:
+                entity_class = entity_data.get("entity_class", "").lower()
+                profile = (
+                    _INTERFERON_BONUS_BY_LOWER_CLASS.get(entity_class, 0.0),
+                    entity_data.get("location", "unknown"),
+                )
+            else:
+                profile = (0.0, "unknown")
+            self._entity_profiles[entity_name] = profile
+        return profile
+
     def process_turn(self) -> List[str]:
         """Process one simulation turn."""
         self.turn_count += 1
-        starting_entities = self.entities.copy()
-        changes = []
+
+        # Change records grouped by rule name, in first-seen order, for the log
+        logging_enabled = self.logging_enabled
+        events: Dict[str, Dict[str, List[Dict]]] = {}
 
         # Apply degradation first
-        degradation_changes = self.apply_degradation(starting_entities)
-        changes.extend(degradation_changes)
+        degradation_changes = self.apply_degradation(self.entities)
+        if degradation_changes and logging_enabled:
+            events["Natural degradation"] = {"consumed": [], "produced": [], "degraded": degradation_changes}
 
-        working_entities = starting_entities.copy()
+        # Work on the state in place (no per-turn copy): degradation was
+        # drawn above, so rules draw from what survived it
+        working_entities = self.entities
         for change in degradation_changes:
-            if change["type"] == "degraded":
-                entity_name = change["entity"]
-                count = change["count"]
-                working_entities[entity_name] -= count
-                if working_entities[entity_name] <= 0:
-                    del working_entities[entity_name]
-
-        # Process transition rules
-        interferon_added_this_turn = 0.0
-        for rule in self.transition_rules:
-            rule_changes = self.apply_rule_to_state(rule, working_entities)
-            changes.extend(rule_changes)
-
-            interferon_added = self._process_rule_interferon_effects(rule, rule_changes)
-            if interferon_added > 0:
-                interferon_added_this_turn += interferon_added
-
-            for change in rule_changes:
-                if change["type"] == "consumed":
-                    entity_name = change["entity"]
-                    count = change["count"]
-                    working_entities[entity_name] -= count
-                    if working_entities[entity_name] <= 0:
-                        del working_entities[entity_name]
+            entity_name = change["entity"]
+            remaining = working_entities[entity_name] - change["count"]
+            if remaining > 0:
+                working_entities[entity_name] = remaining
+            else:
+                del working_entities[entity_name]
 
-        # Apply interferon decay
-        self.interferon_level = max(INTERFERON_MIN, self.interferon_level - INTERFERON_DECAY_PER_TURN)
+        # Process transition rules; _fire_rules deducts consumed inputs from the
+        # working state, outputs only arrive at the end of the turn
+        interferon_added_this_turn = 0.0
+        produced_totals = Counter()
+        if self._compiled_fire_rules is not None:
+            fired = self._compiled_fire_rules(working_entities, self._rng.random)
+        else:
+            fired = _fire_rules(self._candidate_rules(working_entities), working_entities, self._rng.random)
+        for baked, applications in fired:
+            for entity_name, count in baked.outputs:
+                produced_totals[entity_name] += applications * count
 
-        # Add interferon generated this turn
+            if logging_enabled:
+                consumed, produced = self._rule_changes_for_applications(baked, applications)
+                if consumed or produced:
+                    event = events.get(baked.name)
+                    if event is None:
+                        event = events[baked.name] = {"consumed": [], "produced": [], "degraded": []}
+                    event["consumed"].extend(consumed)
+                    event["produced"].extend(produced)
+
+            # The firing count is known here; no need to re-derive it from the changes
+            interferon_added_this_turn += applications * baked.interferon_amount
+
+        # Decay (floored at the minimum), then add this turn's interferon
+        # (capped at the maximum), rounding once for the whole turn
+        interferon_level = max(INTERFERON_MIN, self.interferon_level - INTERFERON_DECAY_PER_TURN)
         if interferon_added_this_turn > 0:
-            self.interferon_level = min(INTERFERON_MAX, self.interferon_level + interferon_added_this_turn)
+            interferon_level = min(INTERFERON_MAX, interferon_level + interferon_added_this_turn)
+        self.interferon_level = round(interferon_level, INTERFERON_PRECISION)
+
+        # working_entities already lacks everything degraded or consumed
+        for entity_name, count in produced_totals.items():
+            working_entities[entity_name] = working_entities.get(entity_name, 0) + count
 
-        self.apply_all_changes(changes)
+        if not logging_enabled:
+            return []
 
-        turn_log = self.generate_turn_log(starting_entities, changes, interferon_added_this_turn)
+        turn_log = self.generate_turn_log(events, interferon_added_this_turn)
         self.console_log.extend(turn_log)
 
         return turn_log
 
+    def _candidate_rules(self, working_entities: Dict[str, int]) -> List["_BakedRule"]:
+        """
+        Get the rules, in blueprint order, that need at least one present entity.
+
+        The working state only shrinks while rules fire, so a rule with no
+        input present now cannot fire later in the turn and is skipped
+        without touching its inputs or the RNG.
+        """
+        rules_by_input = self._rules_by_input
+        indexes = set()
+        for entity_name in working_entities:
+            rule_indexes = rules_by_input.get(entity_name)
+            if rule_indexes:
+                indexes.update(rule_indexes)
+        baked_rules = self._baked_rules
+        return [baked_rules[index] for index in sorted(indexes)]
+
     def _estimate_applications_from_changes(self, rule: Dict, rule_changes: List[Dict]) -> int:
         """Estimate how many times a rule actually applied."""
         consumed_counts = {}
@@ -289,35 +629,37 @@ class ViralSimulation:
 
         return 0
 
-    def _process_rule_interferon_effects(self, rule: Dict, rule_changes: List[Dict]) -> float:
-        """Process interferon effects for a rule."""
-        interferon_amount = float(rule.get("interferon_amount", 0.0) or 0.0)
-        if interferon_amount <= 0:
-            return 0.0
-
-        successful_applications = self._estimate_applications_from_changes(rule, rule_changes)
-        total_interferon = successful_applications * interferon_amount
-        return round(total_interferon, INTERFERON_PRECISION)
-
     def apply_degradation(self, entity_state: Dict[str, int]) -> List[Dict]:
         """Apply degradation to entities."""
         degradation_changes = []
 
+        # rate = base * (1 + bonus), bonus = interferon * class multiplier
+        interferon_level = self.interferon_level if self._db_manager else 0.0
+        coefficients = self._degradation_coefficients
+        uniform = self._rng.random
+
         for entity_name, count in entity_state.items():
             if count <= 0:
                 continue
 
-            base_degradation_rate = self.degradation_rates.get(entity_name, 0.05)
-            interferon_bonus = self._calculate_interferon_degradation_bonus(entity_name)
-            final_degradation_rate = min(1.0, base_degradation_rate * (1.0 + interferon_bonus))
+            entity_coefficients = coefficients.get(entity_name)
+            if entity_coefficients is None:
+                entity_coefficients = coefficients[entity_name] = (
+                    self.degradation_rates.get(entity_name, 0.05),
+                    self._entity_profile(entity_name)[0],
+                )
+            base_degradation_rate, multiplier = entity_coefficients
+
+            if interferon_level > 0:
+                interferon_bonus = round(interferon_level * multiplier, 4)
+                final_degradation_rate = min(1.0, base_degradation_rate * (1.0 + interferon_bonus))
+            else:
+                final_degradation_rate = min(1.0, base_degradation_rate)
 
             if final_degradation_rate <= 0:
                 continue
 
-            degraded_count = 0
-            for _ in range(count):
-                if random.random() < final_degradation_rate:
-                    degraded_count += 1
+            degraded_count = _binomial(uniform, count, final_degradation_rate)
 
             if degraded_count > 0:
                 degradation_changes.append({
@@ -331,106 +673,70 @@ class ViralSimulation:
 
     def _calculate_interferon_degradation_bonus(self, entity_name: str) -> float:
         """Calculate additional degradation rate due to interferon."""
-        if self.interferon_level <= 0 or not self.db_manager:
-            return 0.0
-
-        entity_data = self.db_manager.get_entity(entity_name)
-        if not entity_data:
+        if self.interferon_level <= 0 or not self._db_manager:
             return 0.0
 
-        entity_class = entity_data.get("entity_class", "").lower()
-
-        interferon_multipliers = {
-            ENTITY_CLASS_RNA.lower(): INTERFERON_RNA_DEGRADATION_BONUS,
-            ENTITY_CLASS_PROTEIN.lower(): INTERFERON_PROTEIN_DEGRADATION_BONUS,
-            ENTITY_CLASS_DNA.lower(): INTERFERON_DNA_DEGRADATION_BONUS
-        }
-
-        multiplier = interferon_multipliers.get(entity_class, 0.0)
+        multiplier = self._entity_profile(entity_name)[0]
         bonus = self.interferon_level * multiplier
 
         return round(bonus, 4)
 
     def apply_rule_to_state(self, rule: Dict, entity_state: Dict[str, int]) -> List[Dict]:
         """Apply a single transition rule to a given entity state."""
-        max_applications = self.get_max_applications_from_state(rule, entity_state)
-        if max_applications == 0:
-            return []
-
-        if rule["rule_type"] == "per_entity":
-            actual_applications = sum(1 for _ in range(max_applications)
-                                      if random.random() < rule["probability"])
-        elif rule["rule_type"] == "per_pair":
-            actual_applications = sum(1 for _ in range(max_applications)
-                                      if random.random() < rule["probability"])
-        else:
-            actual_applications = 0
-
+        baked = _bake_rule(rule)
+        actual_applications = self._draw_rule_applications(baked, entity_state)
         if actual_applications == 0:
             return []
+        consumed, produced = self._rule_changes_for_applications(baked, actual_applications)
+        return consumed + produced
 
-        changes = []
-
-        for input_spec in rule["inputs"]:
-            if input_spec["consumed"]:
-                consumed = actual_applications * input_spec["count"]
-                entity_name = input_spec["entity"]
-
-                changes.append({
-                    "type": "consumed",
-                    "entity": entity_name,
-                    "count": consumed,
-                    "rule_name": rule["name"]
-                })
-
-        for output_spec in rule["outputs"]:
-            produced = actual_applications * output_spec["count"]
-            entity_name = output_spec["entity"]
-
-            changes.append({
+    def _draw_rule_applications(self, baked: "_BakedRule", entity_state: Dict[str, int]) -> int:
+        """Draw how many times a baked rule fires this turn from a given state."""
+        max_applications = _max_applications(baked.inputs, entity_state)
+        if max_applications == 0:
+            return 0
+        return _binomial(self._rng.random, max_applications, baked.probability)
+
+    @staticmethod
+    def _rule_changes_for_applications(
+            baked: "_BakedRule", actual_applications: int
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Build the consumed and produced change records for a rule that fired."""
+        rule_name = baked.name
+        consumed = [
+            {
+                "type": "consumed",
+                "entity": entity_name,
+                "count": actual_applications * count,
+                "rule_name": rule_name
+            }
+            for entity_name, count in baked.consumed
+        ]
+        produced = [
+            {
                 "type": "produced",
                 "entity": entity_name,
-                "count": produced,
-                "rule_name": rule["name"]
-            })
-
-        return changes
+                "count": actual_applications * count,
+                "rule_name": rule_name
+            }
+            for entity_name, count in baked.outputs
+        ]
+        return consumed, produced
 
     def get_max_applications_from_state(self, rule: Dict, entity_state: Dict[str, int]) -> int:
         """Calculate maximum times rule can be applied from a given state."""
-        max_apps = float('inf')
-
-        for input_spec in rule["inputs"]:
-            entity_name = input_spec["entity"]
-            required_count = input_spec["count"]
-            available = entity_state.get(entity_name, 0)
-
-            if available < required_count:
-                return 0
-
-            if input_spec["consumed"]:
-                max_apps = min(max_apps, available // required_count)
-            else:
-                max_apps = min(max_apps, available // required_count)
-
-        return max_apps if max_apps != float('inf') else 0
+        return _max_applications(_bake_rule(rule).inputs, entity_state)
 
     def apply_all_changes(self, changes: List[Dict]):
         """Apply all accumulated changes to the entity state."""
-        consumed = {}
-        produced = {}
-        degraded = {}
-
+        totals = {"consumed": Counter(), "produced": Counter(), "degraded": Counter()}
         for change in changes:
-            entity_name = change["entity"]
-            count = change["count"]
-
-            if change["type"] == "consumed":
-                consumed[entity_name] = consumed.get(entity_name, 0) + count
-            elif change["type"] == "produced":
-                produced[entity_name] = produced.get(entity_name, 0) + count
-            elif change["type"] == "degraded":
-                degraded[entity_name] = degraded.get(entity_name, 0) + count
+            change_totals = totals.get(change["type"])
+            if change_totals is not None:
+                change_totals[change["entity"]] += change["count"]
+        consumed = totals["consumed"]
+        produced = totals["produced"]
+        degraded = totals["degraded"]
 
         for entity_name, count in degraded.items():
             if entity_name in self.entities:
@@ -451,40 +757,32 @@ class ViralSimulation:
                 self.entities[entity_name] = count
 
     def generate_turn_log(
-        self, starting_entities: Dict, changes: List[Dict], interferon_added_this_turn: float = 0.0
+        self, rule_changes: Dict[str, Dict[str, List[Dict]]], interferon_added_this_turn: float = 0.0
     ) -> List[str]:
-        """Generate console log for this turn."""
+        """
+        Generate console log for this turn.
+
+        rule_changes maps each rule name to its "consumed", "produced" and
+        "degraded" change records, as grouped by process_turn.
+        """
         log_entries = []
 
         if self.turn_count == 1:
-            log_entries.append("=" * 70)
+            log_entries.append(CONSOLE_SEPARATOR_FULL)
             log_entries.append("  SIMULATION START")
-            log_entries.append("=" * 70)
+            log_entries.append(CONSOLE_SEPARATOR_FULL)
         else:
             log_entries.append("")
-            log_entries.append("-" * 70)
+            log_entries.append(CONSOLE_SEPARATOR_HALF)
 
         log_entries.append(f"  TURN {self.turn_count}")
-        log_entries.append("-" * 70)
+        log_entries.append(CONSOLE_SEPARATOR_HALF)
 
         # EVENTS SECTION
-        if changes:
+        if rule_changes:
             log_entries.append("")
             log_entries.append("  Events this turn:")
 
-            rule_changes = {}
-            for change in changes:
-                rule_name = change["rule_name"]
-                if rule_name not in rule_changes:
-                    rule_changes[rule_name] = {"consumed": [], "produced": [], "degraded": []}
-
-                if change["type"] == "consumed":
-                    rule_changes[rule_name]["consumed"].append(change)
-                elif change["type"] == "produced":
-                    rule_changes[rule_name]["produced"].append(change)
-                elif change["type"] == "degraded":
-                    rule_changes[rule_name]["degraded"].append(change)
-
             event_count = 0
 
             # Degradation events first
@@ -552,7 +850,7 @@ class ViralSimulation:
                                 log_entries.append(f"          + {item}")
 
                     # Show interferon generation
-                    rule_def = next((r for r in self.transition_rules if r.get("name") == rule_name), None)
+                    rule_def = self._rules_by_name.get(rule_name)
                     if rule_def:
                         rule_interferon = float(rule_def.get("interferon_amount", 0.0) or 0.0)
                         if rule_interferon > 0:
@@ -603,6 +901,7 @@ class ViralSimulation:
         entities_by_location = self._group_entities_by_location()
 
         sections = []
+        processed = set()
 
         for location in LOCATION_DISPLAY_ORDER:
             if location in entities_by_location:
@@ -612,9 +911,11 @@ class ViralSimulation:
                     LOCATION_DISPLAY_LABELS.get(location, location.upper())
                 )
                 sections.append(section)
-                del entities_by_location[location]
+                processed.add(location)
 
         for location, location_entities in entities_by_location.items():
+            if location in processed:
+                continue
             section = self._format_location_section_for_log(
                 location,
                 location_entities,
@@ -625,28 +926,34 @@ class ViralSimulation:
         return sections
 
     def _group_entities_by_location(self) -> Dict[str, List[tuple[str, int]]]:
-        """Group entities by their location property."""
-        entities_by_location = {}
+        """Group entities by their location property, each list in display order."""
+        entities = self.entities
+        if not entities.keys() <= self._display_order.keys():
+            # Entities were added from outside the blueprint; sort them in once
+            self._display_order = self._sorted_display_names(list(self._display_order) + list(entities))
 
-        for entity_name, count in self.entities.items():
-            location = "unknown"
-            if self.db_manager:
-                entity_data = self.db_manager.get_entity(entity_name)
-                if entity_data:
-                    location = entity_data.get("location", "unknown")
+        entities_by_location = {}
 
+        for entity_name in self._display_order:
+            count = entities.get(entity_name)
+            if count is None:
+                continue
+            location = self._entity_profile(entity_name)[1]
             if location not in entities_by_location:
                 entities_by_location[location] = []
             entities_by_location[location].append((entity_name, count))
 
         return entities_by_location
 
+    @staticmethod
+    def _sorted_display_names(entity_names: List[str]) -> Dict[str, None]:
+        """Order entity names case-insensitively, as an ordered set."""
+        return dict.fromkeys(sorted(dict.fromkeys(entity_names), key=str.lower))
+
     def _format_location_section_for_log(
         self, location: str, location_entities: List[tuple[str, int]], label: str
     ) -> List[str]:
-        """Format a location section for the console log."""
-        location_entities.sort(key=lambda x: x[0].lower())
-
+        """Format a location section for the console log (entities already in display order)."""
         section = []
         section.append(f"    [{label}]")
 
@@ -657,18 +964,11 @@ class ViralSimulation:
         return section
 
     def _format_entity_name(self, entity_name: str) -> str:
-        """Format entity names for better readability."""
-        if len(entity_name) > 45:
-            if "(extracellular)" in entity_name:
-                return entity_name.replace("(extracellular)", "(ext)")
-            elif "(cytoplasm)" in entity_name:
-                return entity_name.replace("(cytoplasm)", "(cyto)")
-            elif "(endosome)" in entity_name:
-                return entity_name.replace("(endosome)", "(endo)")
-            elif "(nucleus)" in entity_name:
-                return entity_name.replace("(nucleus)", "(nuc)")
-
-        return entity_name
+        """Format entity names for better readability (cached per name)."""
+        display_name = self._display_names.get(entity_name)
+        if display_name is None:
+            display_name = self._display_names[entity_name] = _abbreviate_entity_name(entity_name)
+        return display_name
 
     def is_simulation_over(self) -> bool:
         """Check if simulation should end."""
@@ -676,4 +976,72 @@ class ViralSimulation:
 
     def get_interferon_level(self) -> float:
         """Get current interferon level."""
-        return self.interferon_level
\ No newline at end of file
+        return self.interferon_level
+
+
+class BatchedViralSimulation:
+    """
+    Runs many independent simulations of one virus blueprint side by side.
+
+    Meant for Monte Carlo and sensitivity studies that only look at the
+    population and interferon numbers: the replicas share the baked rules,
+    the compiled rule step and the entity caches, and keep no turn log.
+    """
+
+    def __init__(self, virus_blueprint: Dict, replicas: int, *, seed: Optional[int] = None):
+        if replicas < 1:
+            raise ValueError(f"replicas must be at least 1, got {replicas}")
+
+        # One seed stream makes the whole batch reproducible from a single seed
+        seeder = random.Random(seed)
+        template = ViralSimulation(virus_blueprint, seed=seeder.getrandbits(64))
+        template.logging_enabled = False
+        self.simulations: List[ViralSimulation] = [template]
+        for _ in range(replicas - 1):
+            self.simulations.append(template._replicate(seeder.getrandbits(64)))
+        self.turn_count = 0
+
+    @property
+    def db_manager(self):
+        """Database used for entity classes and locations (shared by every replica)."""
+        return self.simulations[0].db_manager
+
+    @db_manager.setter
+    def db_manager(self, db_manager):
+        # The replicas share their entity caches, so clearing them once is enough
+        self.simulations[0].db_manager = db_manager
+        for simulation in self.simulations[1:]:
+            simulation._db_manager = db_manager
+
+    @property
+    def entities(self) -> List[Dict[str, int]]:
+        """Current entity counts of every replica, in replica order."""
+        return [simulation.entities for simulation in self.simulations]
+
+    @property
+    def interferon_levels(self) -> List[float]:
+        """Current interferon level of every replica, in replica order."""
+        return [simulation.interferon_level for simulation in self.simulations]
+
+    def process_turn(self):
+        """Advance every replica by one turn (extinct ones included, so turn counts stay aligned)."""
+        self.turn_count += 1
+        for simulation in self.simulations:
+            simulation.process_turn()
+
+    def run(self, turns: int, stop_when_over: bool = True) -> List[Dict[str, int]]:
+        """
+        Process up to the given number of turns and return the final entities.
+
+        Stops early once every replica has gone extinct unless stop_when_over
+        is False.
+        """
+        for _ in range(turns):
+            if stop_when_over and self.is_simulation_over():
+                break
+            self.process_turn()
+        return self.entities
+
+    def is_simulation_over(self) -> bool:
+        """Check if every replica has ended."""
+        return all(simulation.is_simulation_over() for simulation in self.simulations)
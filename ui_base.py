@@ -6,14 +6,50 @@ Provides abstract base classes and shared UI utilities for all game modules.
 
 import tkinter as tk
 from tkinter import ttk
+import tkinter.font as tkfont
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, Iterable, Optional
 
 from constants import (
     TEXT_WIDGET_CONFIG,
     CONSOLE_WIDGET_CONFIG,
 )
 
+# Pre-expanded once at import; Tk's configure() takes a plain dict as cnf
+# directly, so no kwargs dict is rebuilt per styled widget.
+_CONSOLE_WIDGET_CNF = dict(CONSOLE_WIDGET_CONFIG)
+
+
+def _tcl_word(value: Any) -> str:
+    """Brace-quote a value (tuples become Tcl lists) for use in a Tcl script."""
+    if isinstance(value, (tuple, list)):
+        return "{" + " ".join(_tcl_word(item) for item in value) + "}"
+    return "{" + str(value) + "}"
+
+
+# style_text_widget runs as one Tcl script (widget options plus the three
+# text tags) instead of four separate commands; %W is the widget path
+_TEXT_WIDGET_STYLE_SCRIPT = "; ".join((
+    "%W configure " + " ".join(f"-{option} {_tcl_word(value)}" for option, value in TEXT_WIDGET_CONFIG.items()),
+    "%W tag configure header -font vs_header -foreground {#1a202c}",
+    "%W tag configure subheader -font vs_subheader -foreground {#2d3748}",
+    "%W tag configure emphasis -font vs_emphasis -foreground {#4a5568}",
+))
+
+# Named fonts for the text tags, created on the first styled widget (fonts
+# need a running Tk) and kept referenced here, since Tk deletes a named font
+# once its Font object is collected
+_TEXT_TAG_FONT_SPECS = (
+    ("vs_header", dict(family="Segoe UI", size=12, weight="bold")),
+    ("vs_subheader", dict(family="Segoe UI", size=11, weight="bold")),
+    ("vs_emphasis", dict(family="Segoe UI", size=11, slant="italic")),
+)
+_text_tag_fonts: Dict[str, tkfont.Font] = {}
+
+# Delay before a listbox click callback runs; later events in the window
+# restart it, so one click or key-repeat burst runs the callback once
+_LISTBOX_CLICK_DEBOUNCE_MS = 20
+
 
 class GameModule(ABC):
     """Abstract base class for all game modules."""
@@ -42,23 +78,46 @@ class GameModule(ABC):
         self.frame.destroy()
 
 
+class ScrollableListbox(tuple):
+    """
+    Widgets made by UIUtilities.create_scrollable_listbox.
+
+    Still the (listbox, scrollbar) tuple it used to return, so unpacking,
+    indexing and len() keep working; the bound list variable is the var
+    attribute.
+    """
+
+    def __new__(cls, listbox: tk.Listbox, scrollbar: ttk.Scrollbar, var: tk.Variable):
+        self = super().__new__(cls, (listbox, scrollbar))
+        self.var = var
+        return self
+
+    @property
+    def listbox(self) -> tk.Listbox:
+        return self[0]
+
+    @property
+    def scrollbar(self) -> ttk.Scrollbar:
+        return self[1]
+
+
 class UIUtilities:
     """Shared UI utility functions."""
 
     @staticmethod
     def style_text_widget(text_widget: tk.Text):
         """Apply consistent styling to text widgets for better readability."""
-        text_widget.config(**TEXT_WIDGET_CONFIG)
+        if not _text_tag_fonts:
+            for font_name, font_options in _TEXT_TAG_FONT_SPECS:
+                _text_tag_fonts[font_name] = tkfont.Font(root=text_widget, name=font_name, **font_options)
 
-        # Configure text tags for better formatting
-        text_widget.tag_configure("header", font=("Segoe UI", 12, "bold"), foreground="#1a202c")
-        text_widget.tag_configure("subheader", font=("Segoe UI", 11, "bold"), foreground="#2d3748")
-        text_widget.tag_configure("emphasis", font=("Segoe UI", 11, "italic"), foreground="#4a5568")
+        # Widget options plus header/subheader/emphasis tags, in one round trip
+        text_widget.tk.eval(_TEXT_WIDGET_STYLE_SCRIPT.replace("%W", str(text_widget)))
 
     @staticmethod
     def style_console_widget(text_widget: tk.Text):
         """Apply console-specific styling to text widgets."""
-        text_widget.config(**CONSOLE_WIDGET_CONFIG)
+        text_widget.config(_CONSOLE_WIDGET_CNF)
 
     @staticmethod
     def center_dialog(dialog: tk.Toplevel, width: int, height: int):
@@ -111,14 +170,21 @@ class UIUtilities:
     @staticmethod
     def create_scrollable_listbox(
             parent: tk.Widget,
+            items: Optional[Iterable[str]] = None,
             width: int = 35,
             height: int = 20,
             selectmode: str = tk.SINGLE
-    ) -> tuple[tk.Listbox, ttk.Scrollbar]:
-        """Create a listbox with scrollbar."""
+    ) -> "ScrollableListbox":
+        """
+        Create a listbox with scrollbar, optionally filled with items.
+
+        The listbox is bound to a list variable, so its contents can be
+        replaced in one call with var.set(tuple(items)) or bulk_set().
+        """
         frame = ttk.Frame(parent)
 
         listbox = tk.Listbox(frame, width=width, height=height, selectmode=selectmode)
+        var = UIUtilities.bind_list_variable(listbox, items if items is not None else ())
         scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=listbox.yview)
         listbox.config(yscrollcommand=scrollbar.set)
 
@@ -127,7 +193,40 @@ class UIUtilities:
 
         frame.pack(fill=tk.BOTH, expand=True)
 
-        return listbox, scrollbar
+        return ScrollableListbox(listbox, scrollbar, var)
+
+    @staticmethod
+    def bind_list_variable(listbox: tk.Listbox, items: Iterable[str] = ()) -> tk.Variable:
+        """
+        Bind a listbox to a new list variable so bulk_set() refills it in one command.
+
+        Keep a reference to the returned variable for as long as the listbox
+        lives: tkinter unsets a variable's Tcl value once it is collected.
+        """
+        var = tk.Variable(listbox, value=tuple(items))
+        listbox.config(listvariable=var)
+        return var
+
+    @staticmethod
+    def bulk_set(listbox: tk.Listbox, items: Iterable[str]):
+        """
+        Replace a listbox's contents in one call.
+
+        Use this instead of inserting item by item in a loop: every
+        insert() is a separate Tcl command. A listbox bound to a list
+        variable is refilled by setting the variable.
+        """
+        items = tuple(items)
+        variable_name = str(listbox.cget("listvariable"))
+        if variable_name:
+            # Setting the variable keeps the old selection; delete() used to drop it
+            listbox.selection_clear(0, tk.END)
+            listbox.setvar(variable_name, items)
+            return
+
+        listbox.delete(0, tk.END)
+        if items:
+            listbox.insert(tk.END, *items)
 
     @staticmethod
     def create_button_row(
@@ -164,22 +263,49 @@ class UIUtilities:
             on_select_callback: callable,
             on_click_callback: callable = None
     ):
-        """Bind standard selection events to a listbox."""
+        """
+        Bind standard selection events to a listbox.
+
+        on_click_callback is debounced: a click (press, release, double
+        click and the resulting selection) or a burst of arrow-key repeats
+        runs it once, after the selection has settled.
+        """
         listbox.bind('<<ListboxSelect>>', on_select_callback)
 
         if on_click_callback:
-            listbox.bind('<Button-1>', lambda e: listbox.after(10, on_click_callback))
-            listbox.bind('<ButtonRelease-1>', lambda e: listbox.after(10, on_click_callback))
-            listbox.bind('<Double-Button-1>', lambda e: on_click_callback())
+            pending_id = None
+
+            def run_click_callback():
+                nonlocal pending_id
+                pending_id = None
+                on_click_callback()
+
+            def schedule_click_callback(event=None):
+                nonlocal pending_id
+                if pending_id is not None:
+                    listbox.after_cancel(pending_id)
+                pending_id = listbox.after(_LISTBOX_CLICK_DEBOUNCE_MS, run_click_callback)
+
+            listbox.bind('<<ListboxSelect>>', schedule_click_callback, add='+')
+            for sequence in ('<Button-1>', '<ButtonRelease-1>', '<Double-Button-1>',
+                             '<KeyRelease-Up>', '<KeyRelease-Down>'):
+                listbox.bind(sequence, schedule_click_callback)
 
 
 class CustomStyles:
     """Custom ttk styles for the application."""
 
+    # The styles live in Tk's style database, so configuring them once is enough
+    _configured = False
+    _style: Optional[ttk.Style] = None
+
     @staticmethod
     def setup_styles():
-        """Setup custom ttk styles."""
-        style = ttk.Style()
+        """Setup custom ttk styles (only the first call does any work)."""
+        if CustomStyles._configured:
+            return
+
+        style = CustomStyles._style = ttk.Style()
 
         # Accent button style for primary actions
         style.configure(
@@ -195,8 +321,10 @@ class CustomStyles:
             borderwidth=1
         )
 
+        CustomStyles._configured = True
+
     @staticmethod
     def apply_to_widget(widget: tk.Widget, style_name: str):
-        """Apply a custom style to a widget."""
-        if hasattr(widget, 'configure'):
+        """Apply a custom style to a widget, unless it already uses it."""
+        if hasattr(widget, 'configure') and str(widget.cget('style')) != style_name:
             widget.configure(style=style_name)
\ No newline at end of file
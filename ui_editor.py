@@ -10,9 +10,7 @@ import os
 from typing import Optional, Dict, List
 
 from constants import (
-    FONT_HEADER,
-    FONT_SMALL,
-    FONT_ITALIC_SMALL,
+    FONTS,
     EDITOR_LISTBOX_WIDTH,
     EDITOR_LISTBOX_HEIGHT,
     EDITOR_DESC_TEXT_HEIGHT,
@@ -20,10 +18,10 @@ from constants import (
     EDITOR_GENE_DESC_WIDTH,
     EFFECT_EDITOR_MAX_INPUTS,
     EFFECT_EDITOR_MAX_OUTPUTS,
-    VALID_LOCATIONS,
-    VALID_ENTITY_CLASSES,
+    VALID_LOCATIONS_ORDER,
+    VALID_ENTITY_CLASSES_ORDER,
     VALID_RULE_TYPES,
-    VALID_MILESTONE_TYPES,
+    VALID_MILESTONE_TYPES_ORDER,
     MIN_DEGRADATION_RATE,
     MAX_DEGRADATION_RATE,
     INTERFERON_MIN,
@@ -44,14 +42,34 @@ class EditorModule(GameModule):
         self.current_entity_name: Optional[str] = None
         self.current_gene_name: Optional[str] = None
         self.current_milestone_id: Optional[str] = None
+        # Set when the database changes while the editor is hidden
+        self._display_stale = False
         super().__init__(parent, controller)
 
+    def show(self):
+        super().show()
+        if self._display_stale:
+            self.refresh_all()
+
+    def set_database_manager(self, db_manager: GeneDatabaseManager):
+        """Attach a database; the display refreshes the next time the editor is shown."""
+        self.db_manager = db_manager
+        self._display_stale = True
+
+    def refresh_all(self):
+        """Refresh the database info and the entity, gene and milestone lists."""
+        self._display_stale = False
+        self.update_database_display()
+        self.update_entity_list()
+        self.update_gene_list()
+        self.update_milestone_list()
+
     def setup_ui(self):
         # Header
         header_frame = ttk.Frame(self.frame)
         header_frame.pack(fill=tk.X, padx=10, pady=5)
 
-        ttk.Label(header_frame, text="Gene Database Editor", font=FONT_HEADER).pack(side=tk.LEFT)
+        ttk.Label(header_frame, text="Gene Database Editor", font=FONTS.HEADER).pack(side=tk.LEFT)
 
         # File operations
         file_frame = ttk.Frame(header_frame)
@@ -92,7 +110,7 @@ class EditorModule(GameModule):
         self.db_desc_text.grid(row=1, column=1, columnspan=3, sticky=tk.W, pady=(10, 0))
 
         # Status
-        self.status_label = ttk.Label(info_frame, text="No database loaded", font=FONT_SMALL)
+        self.status_label = ttk.Label(info_frame, text="No database loaded", font=FONTS.SMALL)
         self.status_label.pack(anchor=tk.W, pady=(10, 0))
 
         # Main content area with tabs
@@ -136,6 +154,7 @@ class EditorModule(GameModule):
         entity_list_frame.pack(fill=tk.BOTH, expand=True)
 
         self.entity_listbox = tk.Listbox(entity_list_frame, width=EDITOR_LISTBOX_WIDTH, height=EDITOR_LISTBOX_HEIGHT)
+        self.entity_list_var = UIUtilities.bind_list_variable(self.entity_listbox)
         self.entity_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         UIUtilities.bind_listbox_selection(
@@ -155,7 +174,7 @@ class EditorModule(GameModule):
         ttk.Button(entity_btn_frame, text="New Entity", command=self.new_entity).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(entity_btn_frame, text="Clone Entity", command=self.clone_entity).pack(side=tk.LEFT, padx=(0, 5))
 
-        ttk.Label(left_frame, text="Click entity to edit →", font=FONT_ITALIC_SMALL).pack(pady=(5, 0))
+        ttk.Label(left_frame, text="Click entity to edit →", font=FONTS.ITALIC_SMALL).pack(pady=(5, 0))
 
         # Right panel - Entity editor
         self.entity_editor_frame = ttk.LabelFrame(main_frame, text="Entity Editor", padding=10)
@@ -164,7 +183,7 @@ class EditorModule(GameModule):
         self.entity_status_label = ttk.Label(
             self.entity_editor_frame,
             text="No entity selected",
-            font=FONT_SMALL
+            font=FONTS.SMALL
         )
         self.entity_status_label.pack(anchor=tk.W, pady=(0, 10))
 
@@ -193,20 +212,20 @@ class EditorModule(GameModule):
         degradation_frame.grid(row=2, column=1, sticky=tk.W, pady=(5, 0))
 
         ttk.Entry(degradation_frame, textvariable=self.degradation_var, width=10).pack(side=tk.LEFT)
-        ttk.Label(degradation_frame, text="(0.0 - 1.0)", font=FONT_ITALIC_SMALL).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(degradation_frame, text="(0.0 - 1.0)", font=FONTS.ITALIC_SMALL).pack(side=tk.LEFT, padx=(5, 0))
 
         # Location
         ttk.Label(props_grid, text="Location:").grid(row=3, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
         self.location_var = tk.StringVar()
         location_combo = ttk.Combobox(props_grid, textvariable=self.location_var, width=20)
-        location_combo['values'] = VALID_LOCATIONS
+        location_combo['values'] = VALID_LOCATIONS_ORDER
         location_combo.grid(row=3, column=1, sticky=tk.W, pady=(5, 0))
 
         # Entity class
         ttk.Label(props_grid, text="Entity Class:").grid(row=3, column=2, sticky=tk.W, padx=(20, 5), pady=(5, 0))
         self.entity_class_var = tk.StringVar()
         class_combo = ttk.Combobox(props_grid, textvariable=self.entity_class_var, width=15)
-        class_combo['values'] = VALID_ENTITY_CLASSES
+        class_combo['values'] = VALID_ENTITY_CLASSES_ORDER
         class_combo.grid(row=3, column=3, sticky=tk.W, pady=(5, 0))
 
         # Starter entity checkbox
@@ -246,6 +265,7 @@ class EditorModule(GameModule):
         gene_list_frame.pack(fill=tk.BOTH, expand=True)
 
         self.gene_listbox = tk.Listbox(gene_list_frame, width=EDITOR_LISTBOX_WIDTH, height=EDITOR_LISTBOX_HEIGHT)
+        self.gene_list_var = UIUtilities.bind_list_variable(self.gene_listbox)
         self.gene_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         UIUtilities.bind_listbox_selection(
@@ -265,13 +285,13 @@ class EditorModule(GameModule):
         ttk.Button(gene_btn_frame, text="New Gene", command=self.new_gene).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(gene_btn_frame, text="Clone Gene", command=self.clone_gene).pack(side=tk.LEFT, padx=(0, 5))
 
-        ttk.Label(left_frame, text="Click gene to edit →", font=FONT_ITALIC_SMALL).pack(pady=(5, 0))
+        ttk.Label(left_frame, text="Click gene to edit →", font=FONTS.ITALIC_SMALL).pack(pady=(5, 0))
 
         # Right panel - Gene editor
         self.gene_editor_frame = ttk.LabelFrame(main_frame, text="Gene Editor", padding=10)
         self.gene_editor_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
-        self.gene_status_label = ttk.Label(self.gene_editor_frame, text="No gene selected", font=FONT_SMALL)
+        self.gene_status_label = ttk.Label(self.gene_editor_frame, text="No gene selected", font=FONTS.SMALL)
         self.gene_status_label.pack(anchor=tk.W, pady=(0, 10))
 
         # Gene properties
@@ -304,6 +324,7 @@ class EditorModule(GameModule):
         prereq_frame.grid(row=2, column=1, columnspan=3, sticky=tk.W, pady=(10, 0))
 
         self.prereq_listbox = tk.Listbox(prereq_frame, height=3, width=40)
+        self.prereq_list_var = UIUtilities.bind_list_variable(self.prereq_listbox)
         self.prereq_listbox.pack(side=tk.LEFT)
 
         prereq_btn_frame = ttk.Frame(prereq_frame)
@@ -330,6 +351,7 @@ class EditorModule(GameModule):
         effects_list_frame.pack(fill=tk.X, pady=(0, 10))
 
         self.effects_listbox = tk.Listbox(effects_list_frame, height=6)
+        self.effects_list_var = UIUtilities.bind_list_variable(self.effects_listbox)
         self.effects_listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
         self.effects_listbox.bind('<<ListboxSelection>>', self.on_effect_select)
 
@@ -367,6 +389,7 @@ class EditorModule(GameModule):
         milestone_list_frame.pack(fill=tk.BOTH, expand=True)
 
         self.milestone_listbox = tk.Listbox(milestone_list_frame, width=EDITOR_LISTBOX_WIDTH, height=EDITOR_LISTBOX_HEIGHT)
+        self.milestone_list_var = UIUtilities.bind_list_variable(self.milestone_listbox)
         self.milestone_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         UIUtilities.bind_listbox_selection(
@@ -386,13 +409,13 @@ class EditorModule(GameModule):
         ttk.Button(milestone_btn_frame, text="New Milestone", command=self.new_milestone).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(milestone_btn_frame, text="Clone Milestone", command=self.clone_milestone).pack(side=tk.LEFT, padx=(0, 5))
 
-        ttk.Label(left_frame, text="Click milestone to edit →", font=FONT_ITALIC_SMALL).pack(pady=(5, 0))
+        ttk.Label(left_frame, text="Click milestone to edit →", font=FONTS.ITALIC_SMALL).pack(pady=(5, 0))
 
         # Right panel - Milestone editor
         self.milestone_editor_frame = ttk.LabelFrame(main_frame, text="Milestone Editor", padding=10)
         self.milestone_editor_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
-        self.milestone_status_label = ttk.Label(self.milestone_editor_frame, text="No milestone selected", font=FONT_SMALL)
+        self.milestone_status_label = ttk.Label(self.milestone_editor_frame, text="No milestone selected", font=FONTS.SMALL)
         self.milestone_status_label.pack(anchor=tk.W, pady=(0, 10))
 
         # Milestone properties
@@ -422,7 +445,7 @@ class EditorModule(GameModule):
         ttk.Label(props_grid, text="Type:").grid(row=2, column=0, sticky=tk.W, padx=(0, 5), pady=(10, 0))
         self.milestone_type_var = tk.StringVar()
         self.milestone_type_combo = ttk.Combobox(props_grid, textvariable=self.milestone_type_var, width=25, state="readonly")
-        self.milestone_type_combo['values'] = VALID_MILESTONE_TYPES
+        self.milestone_type_combo['values'] = VALID_MILESTONE_TYPES_ORDER
         self.milestone_type_combo.grid(row=2, column=1, sticky=tk.W, pady=(10, 0))
         self.milestone_type_combo.bind('<<ComboboxSelected>>', self.on_milestone_type_change)
 
@@ -455,7 +478,7 @@ class EditorModule(GameModule):
         self.milestone_help_label = ttk.Label(
             self.milestone_help_frame,
             text="Select a milestone type to see specific instructions",
-            font=FONT_ITALIC_SMALL,
+            font=FONTS.ITALIC_SMALL,
             foreground="gray"
         )
         self.milestone_help_label.pack(anchor=tk.W)
@@ -540,7 +563,7 @@ class EditorModule(GameModule):
         if old_name and old_name != new_name:
             self.db_manager.delete_entity(old_name)
 
-        self.db_manager.add_entity(entity_data)
+        self.db_manager.add_entity(entity_data, copy=False)
         self.current_entity_name = new_name
 
         self.update_entity_list()
@@ -548,6 +571,9 @@ class EditorModule(GameModule):
         self.update_database_display()
         self.entity_status_label.config(text=f"Selected: {new_name} (Saved)")
 
+        if hasattr(self.controller, 'handle_database_change'):
+            self.controller.handle_database_change()
+
         messagebox.showinfo("Success", f"Entity '{new_name}' saved")
 
     def save_entity_as_new(self):
@@ -603,10 +629,12 @@ class EditorModule(GameModule):
             self.update_database_display()
             self.clear_entity_form()
 
+            if hasattr(self.controller, 'handle_database_change'):
+                self.controller.handle_database_change()
+
     def update_entity_list(self):
         """Update the entity list."""
-        self.entity_listbox.delete(0, tk.END)
-
+        display_texts = []
         for entity_name in sorted(self.db_manager.get_all_entity_names()):
             entity = self.db_manager.get_entity(entity_name)
             degradation = entity.get("base_degradation_rate", 0.05)
@@ -617,7 +645,9 @@ class EditorModule(GameModule):
             else:
                 display_text = f"{entity_name} ({degradation:.2f})"
 
-            self.entity_listbox.insert(tk.END, display_text)
+            display_texts.append(display_text)
+
+        UIUtilities.bulk_set(self.entity_listbox, display_texts)
 
     # =================== GENE HANDLERS ===================
 
@@ -652,14 +682,11 @@ class EditorModule(GameModule):
         self.gene_desc_text.delete(1.0, tk.END)
         self.gene_desc_text.insert(1.0, gene.get("description", ""))
 
-        self.prereq_listbox.delete(0, tk.END)
-        for req in gene.get("requires", []):
-            self.prereq_listbox.insert(tk.END, req)
-
-        self.effects_listbox.delete(0, tk.END)
-        for effect in gene.get("effects", []):
-            effect_desc = self.format_effect_description(effect)
-            self.effects_listbox.insert(tk.END, effect_desc)
+        UIUtilities.bulk_set(self.prereq_listbox, gene.get("requires", []))
+        UIUtilities.bulk_set(
+            self.effects_listbox,
+            [self.format_effect_description(effect) for effect in gene.get("effects", [])]
+        )
 
         self.is_polymerase_var.set(gene.get("is_polymerase", False))
 
@@ -739,13 +766,16 @@ class EditorModule(GameModule):
         if old_name and old_name != new_name:
             self.db_manager.delete_gene(old_name)
 
-        self.db_manager.add_gene(gene_data)
+        self.db_manager.add_gene(gene_data, copy=False)
         self.current_gene_name = new_name
 
         self.update_gene_list()
         self.update_database_display()
         self.gene_status_label.config(text=f"Selected: {new_name} (Saved)")
 
+        if hasattr(self.controller, 'handle_database_change'):
+            self.controller.handle_database_change()
+
         messagebox.showinfo("Success", f"Gene '{new_name}' saved")
 
     def save_gene_as_new(self):
@@ -798,6 +828,9 @@ class EditorModule(GameModule):
             self.update_database_display()
             self.clear_gene_form()
 
+            if hasattr(self.controller, 'handle_database_change'):
+                self.controller.handle_database_change()
+
     def add_prerequisite(self):
         """Add prerequisite gene."""
         available_genes = [name for name in self.db_manager.get_all_genes()
@@ -863,7 +896,7 @@ class EditorModule(GameModule):
 
             updated_gene = gene.copy()
             updated_gene["effects"] = gene_effects
-            self.db_manager.add_gene(updated_gene)
+            self.db_manager.add_gene(updated_gene, copy=False)
 
             self.load_gene_data(self.current_gene_name)
 
@@ -890,14 +923,13 @@ class EditorModule(GameModule):
 
             updated_gene = gene.copy()
             updated_gene["effects"] = effects
-            self.db_manager.add_gene(updated_gene)
+            self.db_manager.add_gene(updated_gene, copy=False)
 
             self.load_gene_data(self.current_gene_name)
 
     def update_gene_list(self):
         """Update the gene list."""
-        self.gene_listbox.delete(0, tk.END)
-
+        display_texts = []
         for gene_name in sorted(self.db_manager.get_all_genes()):
             gene = self.db_manager.get_gene(gene_name)
             cost = gene.get("cost", 0)
@@ -908,7 +940,9 @@ class EditorModule(GameModule):
             else:
                 display_text = f"{gene_name} ({cost} EP)"
 
-            self.gene_listbox.insert(tk.END, display_text)
+            display_texts.append(display_text)
+
+        UIUtilities.bulk_set(self.gene_listbox, display_texts)
 
     # =================== MILESTONE HANDLERS ===================
 
@@ -1002,7 +1036,7 @@ class EditorModule(GameModule):
         if old_id and old_id != new_id:
             self.db_manager.delete_milestone(old_id)
 
-        self.db_manager.add_milestone(milestone_data)
+        self.db_manager.add_milestone(milestone_data, copy=False)
         self.current_milestone_id = new_id
 
         self.update_milestone_list()
@@ -1074,8 +1108,7 @@ class EditorModule(GameModule):
 
     def update_milestone_list(self):
         """Update the milestone list."""
-        self.milestone_listbox.delete(0, tk.END)
-
+        display_texts = []
         for milestone_id in sorted(self.db_manager.get_all_milestones()):
             milestone = self.db_manager.get_milestone(milestone_id)
             reward = milestone.get("reward_ep", 0)
@@ -1091,7 +1124,9 @@ class EditorModule(GameModule):
             else:
                 display_text = f"{milestone_id} ({reward} EP)"
 
-            self.milestone_listbox.insert(tk.END, display_text)
+            display_texts.append(display_text)
+
+        UIUtilities.bulk_set(self.milestone_listbox, display_texts)
 
     # =================== DATABASE OPERATIONS ===================
 
@@ -1472,14 +1507,14 @@ class EffectEditorDialog:
         self.probability_multiplier_var = tk.DoubleVar(value=1.0)
         ttk.Entry(frame, textvariable=self.probability_multiplier_var, width=10).grid(row=1, column=1, sticky=tk.W, pady=(15, 0))
 
-        ttk.Label(frame, text="(1.0 = no change, 1.5 = 50% increase)", font=FONT_ITALIC_SMALL).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        ttk.Label(frame, text="(1.0 = no change, 1.5 = 50% increase)", font=FONTS.ITALIC_SMALL).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
 
         # Interferon multiplier
         ttk.Label(frame, text="Interferon Multiplier:").grid(row=3, column=0, sticky=tk.W, padx=(0, 10), pady=(15, 0))
         self.interferon_multiplier_var = tk.DoubleVar(value=1.0)
         ttk.Entry(frame, textvariable=self.interferon_multiplier_var, width=10).grid(row=3, column=1, sticky=tk.W, pady=(15, 0))
 
-        ttk.Label(frame, text="(1.0 = no change, 2.0 = double)", font=FONT_ITALIC_SMALL).grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        ttk.Label(frame, text="(1.0 = no change, 2.0 = double)", font=FONTS.ITALIC_SMALL).grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
 
     def ok_clicked(self):
         """Handle OK button click."""
@@ -11,12 +11,7 @@ import os
 from typing import Optional, Dict
 
 from constants import (
-    FONT_TITLE,
-    FONT_SUBTITLE,
-    FONT_HEADER,
-    FONT_BODY,
-    FONT_SMALL,
-    FONT_ITALIC_SMALL,
+    FONTS,
     COLOR_SUCCESS,
     COLOR_WARNING,
     COLOR_DANGER,
@@ -40,7 +35,7 @@ class MenuModule(GameModule):
         title_label = ttk.Label(
             self.frame,
             text="Virus Sandbox",
-            font=FONT_TITLE
+            font=FONTS.TITLE
         )
         title_label.pack(pady=50)
 
@@ -48,7 +43,7 @@ class MenuModule(GameModule):
         subtitle_label = ttk.Label(
             self.frame,
             text="Create and simulate your own virtual viruses",
-            font=FONT_SUBTITLE
+            font=FONTS.SUBTITLE
         )
         subtitle_label.pack(pady=(0, 50))
 
@@ -164,29 +159,39 @@ class BuilderModule(GameModule):
 
     def set_game_state(self, game_state: GameState):
         """Give the builder access to EP + deck."""
+        if game_state is self.game_state:
+            return
         self.game_state = game_state
 
         if self.virus_builder:
             self.virus_builder.set_game_state(game_state)
-        self.update_virus_display()
-        self.update_starter_dropdown()
+        # A hidden builder refreshes in show()
+        if self._is_shown():
+            self.update_virus_display()
+            self.update_starter_dropdown()
 
     def set_database_manager(self, db_manager: GeneDatabaseManager):
         """Called by the controller when a DB is loaded."""
+        # No identity shortcut: a new game on the same DB still needs a fresh VirusBuilder
         self.db_manager = db_manager
         self.gene_db = GeneDatabase(db_manager)
         self.virus_builder = VirusBuilder(self.gene_db, self.game_state)
 
-        self.update_gene_list()
-        self.update_virus_display()
-        self.update_starter_dropdown()
+        if self._is_shown():
+            self.update_gene_list()
+            self.update_virus_display()
+            self.update_starter_dropdown()
+
+    def _is_shown(self) -> bool:
+        """Check whether the builder frame is currently packed."""
+        return bool(self.frame.winfo_manager())
 
     def setup_ui(self):
         # Header
         header_frame = ttk.Frame(self.frame)
         header_frame.pack(fill=tk.X, padx=10, pady=5)
 
-        ttk.Label(header_frame, text="Virus Builder", font=FONT_HEADER).pack(side=tk.LEFT)
+        ttk.Label(header_frame, text="Virus Builder", font=FONTS.HEADER).pack(side=tk.LEFT)
 
         # Main content area
         main_frame = ttk.Frame(self.frame)
@@ -220,6 +225,7 @@ class BuilderModule(GameModule):
             selectmode=tk.SINGLE,
             height=BUILDER_GENE_LIST_HEIGHT
         )
+        self.available_genes_var = UIUtilities.bind_list_variable(self.available_genes_list)
         self.available_genes_list.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
 
         UIUtilities.bind_listbox_selection(
@@ -245,6 +251,7 @@ class BuilderModule(GameModule):
             selectmode=tk.SINGLE,
             height=BUILDER_GENE_LIST_HEIGHT
         )
+        self.selected_genes_var = UIUtilities.bind_list_variable(self.selected_genes_list)
         self.selected_genes_list.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
 
         UIUtilities.bind_listbox_selection(
@@ -270,7 +277,7 @@ class BuilderModule(GameModule):
         starter_row = ttk.Frame(controls_frame)
         starter_row.pack(fill=tk.X, pady=(0, 10))
 
-        ttk.Label(starter_row, text="Starting Entity:", font=FONT_SMALL).pack(side=tk.LEFT)
+        ttk.Label(starter_row, text="Starting Entity:", font=FONTS.SMALL).pack(side=tk.LEFT)
         self.starter_var = tk.StringVar()
         self.starter_dropdown = ttk.Combobox(
             starter_row,
@@ -306,7 +313,7 @@ class BuilderModule(GameModule):
         rounds_help = ttk.Label(
             rounds_row,
             text="(Build → Play cycles)",
-            font=FONT_ITALIC_SMALL,
+            font=FONTS.ITALIC_SMALL,
             foreground="gray"
         )
         rounds_help.pack(side=tk.LEFT, padx=(10, 0))
@@ -352,7 +359,7 @@ class BuilderModule(GameModule):
         self.details_status_label = ttk.Label(
             details_controls,
             text="Showing: Virus Properties",
-            font=FONT_ITALIC_SMALL,
+            font=FONTS.ITALIC_SMALL,
             foreground="blue"
         )
         self.details_status_label.pack(side=tk.LEFT, padx=(10, 0))
@@ -660,11 +667,11 @@ class BuilderModule(GameModule):
     def update_virus_display(self):
         """Refresh selected genes, capabilities, EP label, and rounds counter."""
         # Selected genes list
-        self.selected_genes_list.delete(0, tk.END)
+        selected_names = []
         if self.virus_builder:
             for gene in self.virus_builder.selected_genes:
-                gene_name = gene["name"] if isinstance(gene, dict) else str(gene)
-                self.selected_genes_list.insert(tk.END, gene_name)
+                selected_names.append(gene["name"] if isinstance(gene, dict) else str(gene))
+        UIUtilities.bulk_set(self.selected_genes_list, selected_names)
 
         # Update details display based on current mode
         if self.current_display_mode == "virus":
@@ -800,14 +807,15 @@ class BuilderModule(GameModule):
                 continue
             available.append(name)
 
-        self.available_genes_list.delete(0, tk.END)
+        display_texts = []
         for name in available:
             cost = 0
             if self.db_manager:
                 g = self.db_manager.get_gene(name)
                 if g:
                     cost = g.get("cost", 0)
-            self.available_genes_list.insert(tk.END, f"{name} ({cost})")
+            display_texts.append(f"{name} ({cost})")
+        UIUtilities.bulk_set(self.available_genes_list, display_texts)
 
     def add_gene(self):
         """Add the selected gene."""
@@ -866,13 +874,9 @@ class BuilderModule(GameModule):
             self.update_virus_display()
             return
 
-        if not self.game_state.can_afford_insert(gene_name):
-            messagebox.showwarning("Not enough EP", f"You need {cost} EP for {gene_name}.")
-            self.update_virus_display()
-            return
-
+        # spend_for_insert only fails when the EP balance can't cover the cost
         if not self.game_state.spend_for_insert(gene_name):
-            messagebox.showwarning("EP Error", "Could not spend EP for this gene.")
+            messagebox.showwarning("Not enough EP", f"You need {cost} EP for {gene_name}.")
             self.update_virus_display()
             return
 
@@ -887,8 +891,7 @@ class BuilderModule(GameModule):
             self.update_virus_display()
             return
 
-        if gene_name not in self.game_state.installed_genes:
-            self.game_state.installed_genes.append(gene_name)
+        self.game_state.record_installed_gene(gene_name)
 
         self.update_virus_display()
 
@@ -926,8 +929,7 @@ class BuilderModule(GameModule):
 
         self.virus_builder.remove_gene(gene_name)
 
-        if gene_name in self.game_state.installed_genes:
-            self.game_state.installed_genes.remove(gene_name)
+        self.game_state.record_removed_gene(gene_name)
 
         self.update_virus_display()
 
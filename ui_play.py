@@ -10,9 +10,7 @@ import time
 from typing import Optional, Dict, List
 
 from constants import (
-    FONT_HEADER,
-    FONT_BODY,
-    FONT_SMALL,
+    FONTS,
     COLOR_SUCCESS,
     COLOR_WARNING,
     COLOR_DANGER,
@@ -37,6 +35,8 @@ from constants import (
     INTERFERON_THRESHOLD_HIGH,
     INTERFERON_THRESHOLD_MEDIUM,
     INTERFERON_THRESHOLD_LOW,
+    CONSOLE_SEPARATOR_FULL,
+    CONSOLE_SEPARATOR_SECTION,
 )
 from simulation import ViralSimulation
 from game_state import GameState
@@ -68,6 +68,8 @@ class PlayModule(GameModule):
 
     def set_game_state(self, game_state: GameState):
         """Set game state reference."""
+        if game_state is self.game_state:
+            return
         self.game_state = game_state
 
     def set_database_manager(self, db_manager):
@@ -488,6 +490,7 @@ class PlayModule(GameModule):
         gene_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+        display_texts = []
         for gene_name in genes:
             if self.db_manager:
                 gene_data = self.db_manager.get_gene(gene_name)
@@ -500,11 +503,12 @@ class PlayModule(GameModule):
                     else:
                         display_text = f"{gene_name} ({cost} EP)"
 
-                    gene_listbox.insert(tk.END, display_text)
+                    display_texts.append(display_text)
                 else:
-                    gene_listbox.insert(tk.END, f"{gene_name} (Unknown gene)")
+                    display_texts.append(f"{gene_name} (Unknown gene)")
             else:
-                gene_listbox.insert(tk.END, gene_name)
+                display_texts.append(gene_name)
+        UIUtilities.bulk_set(gene_listbox, display_texts)
 
         # Close button
         button_frame = ttk.Frame(dialog)
@@ -737,9 +741,9 @@ class PlayModule(GameModule):
         self.update_interferon_display()
         self.update_entities_display(self.simulation.entities)
 
-        self.add_console_message("=" * 70)
+        self.add_console_message(CONSOLE_SEPARATOR_FULL)
         self.add_console_message("  VIRUS SIMULATION INITIALIZED")
-        self.add_console_message("=" * 70)
+        self.add_console_message(CONSOLE_SEPARATOR_FULL)
         self.add_console_message("Initial infection beginning...")
 
         if self.virus_blueprint.get("genes"):
@@ -898,7 +902,7 @@ class PlayModule(GameModule):
 
             if all_classes:
                 stats_text.insert(tk.END, "Produced in total this round: (peak)\n")
-                stats_text.insert(tk.END, "-" * 35 + "\n")
+                stats_text.insert(tk.END, CONSOLE_SEPARATOR_SECTION + "\n")
 
                 sorted_classes = sorted(
                     all_classes,
@@ -1013,7 +1017,7 @@ class PlayModule(GameModule):
 
             if all_classes:
                 stats_text.insert(tk.END, "Produced in total this round: (peak)\n")
-                stats_text.insert(tk.END, "-" * 35 + "\n")
+                stats_text.insert(tk.END, CONSOLE_SEPARATOR_SECTION + "\n")
 
                 sorted_classes = sorted(
                     all_classes,
@@ -1039,7 +1043,7 @@ class PlayModule(GameModule):
         ttk.Label(
             closing_frame,
             text=closing_text,
-            font=FONT_SMALL,
+            font=FONTS.SMALL,
             justify=tk.CENTER,
             wraplength=450
         ).pack()